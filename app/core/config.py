@@ -5,6 +5,68 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     DATABASE_URL: str = "sqlite+aiosqlite:///./task.db"
+    READ_DATABASE_URL: str | None = None
+    TASK_SHARD_URLS: list[str] = []
+    DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_STATEMENT_CACHE_SIZE: int = 500
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE: int = -64000
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    TASKS_PAGE_SIZE: int = 50
+    TASKS_MAX_PAGE_SIZE: int = 500
+    TASKS_BULK_MAX_ITEMS: int = 500
+    TASKS_EXPORT_CHUNK_SIZE: int = 1000
+    TASKS_IMPORT_BATCH_SIZE: int = 500
+    TASKS_IMPORT_MAX_ERRORS: int = 100
+    TASKS_IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+    TASKS_FAST_JSON: bool = False
+    TASKS_GROUP_COMMIT_ENABLED: bool = False
+    TASKS_GROUP_COMMIT_WINDOW_MS: float = 2.0
+    TASKS_GROUP_COMMIT_MAX_BATCH: int = 64
+    TASK_EVENTS_QUEUE_SIZE: int = 100
+    TASK_EVENTS_MAX_PER_USER: int = 10
+    TASK_EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    TASKS_ARCHIVE_ENABLED: bool = False
+    TASKS_ARCHIVE_AFTER_DAYS: float = 30.0
+    TASKS_ARCHIVE_BATCH_SIZE: int = 500
+    TASKS_ARCHIVE_BATCH_PAUSE_SECONDS: float = 0.05
+    TASKS_ARCHIVE_INTERVAL_SECONDS: float = 300.0
+    TASKS_CHANGES_PAGE_SIZE: int = 200
+    TASK_JOBS_ENABLED: bool = True
+    TASK_JOBS_WORKERS: int = 2
+    TASK_JOBS_BATCH_SIZE: int = 500
+    TASK_JOBS_BATCH_PAUSE_SECONDS: float = 0.05
+    TASK_JOBS_POLL_SECONDS: float = 5.0
+    TASK_JOBS_MAX_PENDING_PER_USER: int = 5
+    TASK_JOBS_STALE_SECONDS: float = 300.0
+    RESPONSE_COMPRESSION_ENABLED: bool = True
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024
+    RESPONSE_COMPRESSION_LEVEL: int = 6
+    TASKS_TOMBSTONE_COMPACTION_ENABLED: bool = True
+    TASKS_TOMBSTONE_RETENTION_DAYS: float = 30.0
+    TASKS_TOMBSTONE_BATCH_SIZE: int = 500
+    TASKS_TOMBSTONE_INTERVAL_SECONDS: float = 3600.0
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_DEPTH: int = 64
+    WARMUP_ENABLED: bool = True
+    WARMUP_POOL_CONNECTIONS: int = 2
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_REPEAT_THRESHOLD: int = 5
+    AUTH_RATE_LIMIT_ENABLED: bool = True
+    AUTH_IP_BURST: int = 20
+    AUTH_IP_PER_MINUTE: float = 60.0
+    AUTH_EMAIL_BURST: int = 5
+    AUTH_EMAIL_PER_MINUTE: float = 10.0
+    AUTH_MAX_CONCURRENT_HASHES: int = 8
+    AUTH_LIMITER_MAX_KEYS: int = 100000
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -1,15 +1,115 @@
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.metrics import Gauge, db_query_duration, registry
 
-engine = create_async_engine(
-    settings.DATABASE_URL, 
-    echo=True,
-    future=True
-)
+def _sqlite_pragmas(read_only: bool):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # The journal mode is a property of the database file; only the
+        # primary sets it, a read-only connection cannot.
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+    return set_pragmas
+
+def _instrument(async_engine, name: str):
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start", None)
+        if start is not None:
+            operation = (statement.split(None, 1) or [""])[0].upper()
+            db_query_duration.observe(time.perf_counter() - start, name, operation)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+def build_engine(url: str, read_only: bool = False):
+    url = make_url(url)
+    options = {
+        "echo": settings.DATABASE_ECHO,
+        "future": True,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "query_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
+    # In-memory SQLite uses a single static connection, which takes no
+    # pool sizing arguments.
+    if url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+        options.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        )
+
+    async_engine = create_async_engine(url, **options)
+    if url.get_backend_name() == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas(read_only))
+    return async_engine
+
+engine = build_engine(settings.DATABASE_URL)
+_instrument(engine, "primary")
 async_session_local = sessionmaker(engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
-Base = declarative_base()
\ No newline at end of file
+# Reads that tolerate replica lag go through read_engine. Without
+# READ_DATABASE_URL it is simply the primary engine.
+if settings.READ_DATABASE_URL:
+    read_engine = build_engine(settings.READ_DATABASE_URL, read_only=True)
+    _instrument(read_engine, "read")
+else:
+    read_engine = engine
+async_read_session_local = sessionmaker(read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+# With TASK_SHARD_URLS set, task tables live on N separate databases so
+# users' writes don't all queue on one SQLite writer lock. Users stay on the
+# primary; shard_for maps a user to the shard holding all of their tasks.
+shard_engines = [build_engine(url) for url in settings.TASK_SHARD_URLS]
+for index, shard_engine in enumerate(shard_engines):
+    _instrument(shard_engine, f"shard{index}")
+shard_session_locals = [
+    sessionmaker(shard_engine, class_=AsyncSession, expire_on_commit=False)
+    for shard_engine in shard_engines
+]
+
+def shard_for(user_id: int) -> int:
+    return user_id % len(shard_engines)
+
+def _pool_usage():
+    usage = {}
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["read"] = read_engine
+    for index, shard_engine in enumerate(shard_engines):
+        engines[f"shard{index}"] = shard_engine
+    for name, async_engine in engines.items():
+        pool = async_engine.pool
+        if hasattr(pool, "checkedout"):
+            usage[(name, "checked_out")] = pool.checkedout()
+            usage[(name, "idle")] = pool.checkedin()
+            usage[(name, "overflow")] = max(pool.overflow(), 0)
+            usage[(name, "size")] = pool.size()
+    return usage
+
+registry.register(Gauge(
+    "db_pool_connections",
+    "Connection pool usage by engine and state.",
+    ("engine", "state"),
+    callback=_pool_usage
+))
+
+Base = declarative_base()
@@ -0,0 +1,120 @@
+import asyncio
+import itertools
+import json
+from app.core.config import settings
+from app.core.metrics import Gauge, registry, task_event_drops
+from app.schemas.task import TaskResponse
+
+RESYNC_FRAME = "event: resync\ndata: {}\n\n"
+
+
+class Subscription:
+    def __init__(self, user_id: int, max_queue: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False
+
+
+class TaskEventBroker:
+    """In-process fan-out of task changes to the SSE streams of their owner.
+
+    publish() encodes an event once and puts the frame on every subscriber
+    queue of that user without waiting. Queues are bounded: a subscriber that
+    falls max_queue frames behind is dropped. Its queue is replaced by a single
+    resync frame, and its stream ends so the client reloads and reconnects.
+    Only streams served by this process see the events.
+    """
+
+    def __init__(self, max_queue: int, max_per_user: int):
+        self.max_queue = max_queue
+        self.max_per_user = max_per_user
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._ids = itertools.count(1)
+
+    def has_capacity(self, user_id: int) -> bool:
+        return len(self._subscribers.get(user_id, ())) < self.max_per_user
+
+    def subscribe(self, user_id: int) -> Subscription | None:
+        if not self.has_capacity(user_id):
+            return None
+        subscription = Subscription(user_id, self.max_queue)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, user_id: int, event: str, data: dict):
+        subscribers = self._subscribers.get(user_id)
+        if not subscribers:
+            return
+        frame = f"id: {next(self._ids)}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+        for subscription in list(subscribers):
+            try:
+                subscription.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def publish_tasks(self, user_id: int, event: str, tasks):
+        if user_id not in self._subscribers:
+            return
+        for task in tasks:
+            self.publish(
+                user_id, event, TaskResponse.model_validate(task).model_dump(mode="json")
+            )
+
+    def publish_deleted(self, user_id: int, task_ids):
+        for task_id in task_ids:
+            self.publish(user_id, "deleted", {"id": task_id})
+
+    def publish_resync(self, user_id: int):
+        # For changes too large to describe one by one; clients refetch.
+        self.publish(user_id, "resync", {})
+
+    def _drop(self, subscription: Subscription):
+        self.unsubscribe(subscription)
+        subscription.dropped = True
+        task_event_drops.inc()
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(RESYNC_FRAME)
+
+    async def stream(self, user_id: int, keepalive_seconds: float):
+        # Subscribes on first iteration, so a response that is never sent
+        # leaves no subscription behind.
+        subscription = self.subscribe(user_id)
+        if subscription is None:
+            yield RESYNC_FRAME
+            return
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscription.queue.get(), keepalive_seconds)
+                except asyncio.TimeoutError:
+                    # Comment line: keeps proxies from timing out idle streams.
+                    yield ": keep-alive\n\n"
+                    continue
+                yield frame
+                if subscription.dropped and subscription.queue.empty():
+                    return
+        finally:
+            self.unsubscribe(subscription)
+
+
+task_events = TaskEventBroker(
+    max_queue=settings.TASK_EVENTS_QUEUE_SIZE,
+    max_per_user=settings.TASK_EVENTS_MAX_PER_USER
+)
+
+registry.register(Gauge(
+    "task_event_subscribers",
+    "Open GET /tasks/events streams.",
+    callback=lambda: {(): task_events.subscriber_count()}
+))
\ No newline at end of file
@@ -0,0 +1,40 @@
+import math
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by an arbitrary string, bounded to max_keys.
+
+    Buckets are kept in LRU order and the least recently used one is dropped
+    once max_keys is reached; a dropped key simply starts again from a full
+    bucket. Only touched from the event loop, without awaiting, so no lock.
+    """
+
+    def __init__(self, capacity: float, per_second: float, max_keys: int):
+        self.capacity = capacity
+        self.per_second = per_second
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, key: str) -> int:
+        """Consume one token; return 0 if allowed, else seconds to wait."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.per_second)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if self.per_second <= 0:
+                return 60
+            return max(1, math.ceil((1 - tokens) / self.per_second))
+
+        self._buckets[key] = (tokens - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return 0
+
+    def clear(self):
+        self._buckets.clear()
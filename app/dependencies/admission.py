@@ -0,0 +1,70 @@
+from fastapi import HTTPException, Request, status
+from app.core.config import settings
+from app.core.rate_limit import TokenBucketLimiter
+
+class AuthAdmission:
+    """Admission control for endpoints that run Argon2.
+
+    Checks a per-IP and a per-email token bucket, then holds one of a fixed
+    number of hashing slots for the rest of the request. Anything over budget
+    is turned away immediately with 429 and Retry-After, before any hashing.
+    """
+
+    def __init__(self):
+        self.ip_limiter = TokenBucketLimiter(
+            capacity=settings.AUTH_IP_BURST,
+            per_second=settings.AUTH_IP_PER_MINUTE / 60,
+            max_keys=settings.AUTH_LIMITER_MAX_KEYS
+        )
+        self.email_limiter = TokenBucketLimiter(
+            capacity=settings.AUTH_EMAIL_BURST,
+            per_second=settings.AUTH_EMAIL_PER_MINUTE / 60,
+            max_keys=settings.AUTH_LIMITER_MAX_KEYS
+        )
+        self.in_flight = 0
+
+    def reset(self):
+        self.ip_limiter.clear()
+        self.email_limiter.clear()
+        self.in_flight = 0
+
+    async def __call__(self, request: Request):
+        if not settings.AUTH_RATE_LIMIT_ENABLED:
+            yield
+            return
+
+        client_ip = request.client.host if request.client else "unknown"
+        retry_after = self.ip_limiter.take(client_ip)
+
+        if not retry_after:
+            email = await _request_email(request)
+            if email:
+                retry_after = self.email_limiter.take(email)
+
+        if not retry_after and self.in_flight >= settings.AUTH_MAX_CONCURRENT_HASHES:
+            retry_after = 1
+
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication attempts",
+                headers={"Retry-After": str(retry_after)}
+            )
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+async def _request_email(request: Request) -> str | None:
+    # FastAPI has already read and cached the body to validate the endpoint's
+    # model, so this does not touch the network again.
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+    email = body.get("email") if isinstance(body, dict) else None
+    return email.strip().lower() if isinstance(email, str) else None
+
+auth_admission = AuthAdmission()
@@ -3,15 +3,17 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.core import database
+from app.core.cache import Principal, principal_cache
 from app.core.config import settings
-from app.dependencies.db import get_db
+from app.dependencies.db import get_read_db
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     auth_error = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -29,12 +31,24 @@ async def get_current_user(
     except JWTError:
         raise auth_error
 
-    stmt = select(User).where(User.id == int(user_id))
-    result = await db.execute(stmt)
-    user = result.scalars().first()
+    user = principal_cache.get(int(user_id))
+    if user is None:
+        stmt = select(User).where(User.id == int(user_id))
+        result = await db.execute(stmt)
+        row = result.scalars().first()
+        if row is None:
+            # A user registered moments ago may not have reached the replica.
+            async with database.async_session_local() as primary:
+                row = (await primary.execute(stmt)).scalars().first()
 
-    if not user:
-        raise auth_error
+        if not row:
+            raise auth_error
+
+        user = Principal(id=row.id, email=row.email, is_active=row.is_active)
+        principal_cache.set(user)
+        # End the read transaction so the request doesn't hold a pooled
+        # connection while it waits on anything else.
+        await db.rollback()
     
     if not user.is_active:
         user_error = HTTPException(
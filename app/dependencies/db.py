@@ -1,5 +1,22 @@
-from app.core.database import async_session_local
+from fastapi import Request
+from app.core.database import async_session_local, async_read_session_local
 
 async def get_db():
     async with async_session_local() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+def pin_primary(request: Request):
+    request.state.read_primary = True
+
+async def get_read_db(request: Request):
+    # Writes, requests pinned by pin_primary, and clients that just wrote and
+    # send X-Read-Primary read from the primary to see the latest data; a
+    # lagging replica would otherwise authenticate a write as a stale user.
+    pinned = (
+        request.method not in ("GET", "HEAD", "OPTIONS")
+        or getattr(request.state, "read_primary", False)
+        or request.headers.get("X-Read-Primary", "").lower() in ("1", "true")
+    )
+    session_factory = async_session_local if pinned else async_read_session_local
+    async with session_factory() as session:
+        yield session
@@ -0,0 +1,32 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import database
+from app.core.cache import Principal
+from app.dependencies.auth import get_current_user
+from app.dependencies.db import get_db, get_read_db
+
+# Task routes take their session from here. Without shards they get the usual
+# primary / read session; with TASK_SHARD_URLS set, a session on the shard
+# that holds the current user's tasks.
+
+async def get_task_db(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    if not database.shard_session_locals:
+        yield db
+        return
+    session_factory = database.shard_session_locals[database.shard_for(current_user.id)]
+    async with session_factory() as session:
+        yield session
+
+async def get_task_read_db(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if not database.shard_session_locals:
+        yield db
+        return
+    session_factory = database.shard_session_locals[database.shard_for(current_user.id)]
+    async with session_factory() as session:
+        yield session
@@ -1,9 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
-from app.core.database import Base, engine
-from app.routers import auth, user, task
+from app.core.config import settings
+from app.core.database import engine, read_engine, shard_engines
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.query_profiler import QueryProfilerMiddleware, install_query_profiler
+from app.routers import auth, user, task, metrics
+from app.services.task_archiver import TaskArchiver
+from app.services.task_jobs import task_job_runner
+from app.services.tombstone_compactor import TombstoneCompactor
+from app.services.warmup_service import WarmupService
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.WARMUP_ENABLED:
+        await WarmupService.run()
+    if settings.TASK_JOBS_ENABLED:
+        await task_job_runner.start()
+    background = []
+    if settings.TASKS_ARCHIVE_ENABLED:
+        background.append(asyncio.create_task(TaskArchiver.run_forever()))
+    if settings.TASKS_TOMBSTONE_COMPACTION_ENABLED:
+        background.append(asyncio.create_task(TombstoneCompactor.run_forever()))
+    yield
+    for job in background:
+        job.cancel()
+        with suppress(asyncio.CancelledError):
+            await job
+    await task_job_runner.stop()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    for shard_engine in shard_engines:
+        await shard_engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_SIZE,
+        level=settings.RESPONSE_COMPRESSION_LEVEL
+    )
+app.add_middleware(MetricsMiddleware)
+
+if settings.QUERY_PROFILER_ENABLED:
+    install_query_profiler(engine, read_engine, *shard_engines)
+    app.add_middleware(
+        QueryProfilerMiddleware,
+        repeat_threshold=settings.QUERY_PROFILER_REPEAT_THRESHOLD
+    )
 
 app.include_router(auth.router)
 app.include_router(user.router)
 app.include_router(task.router)
+app.include_router(metrics.router)
@@ -0,0 +1,148 @@
+import zlib
+
+# zlib wbits: 31 writes a gzip wrapper, 15 the zlib wrapper HTTP calls deflate.
+_WBITS = {"gzip": 31, "deflate": 15}
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick gzip or deflate from an Accept-Encoding header, honouring q-values."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding.strip().lower()] = quality
+    best = None
+    for coding in _WBITS:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (coding, quality)
+    return best[0] if best else None
+
+
+def compressor(encoding: str, level: int):
+    return zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+
+
+class CompressionMiddleware:
+    """Compresses responses with gzip or deflate when the client accepts it.
+
+    A response sent in one piece is compressed only if it is at least
+    minimum_size bytes. Streamed responses, such as exports, are compressed
+    chunk by chunk; event streams are left alone. A strong ETag becomes weak,
+    since the bytes on the wire no longer match it. Every response that could
+    be compressed carries Vary: Accept-Encoding, compressed or not.
+    """
+
+    def __init__(self, app, minimum_size: int, level: int):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding += value.decode("latin-1") + ","
+        encoding = choose_encoding(accept_encoding)
+
+        start = None
+        compress = None
+
+        async def send_wrapper(message):
+            nonlocal start, compress
+            if message["type"] == "http.response.start":
+                if message["status"] == 304:
+                    # A 304 repeats the Vary its 200 would have carried.
+                    await send(_with_vary(message))
+                elif not self._compressible(message):
+                    await send(message)
+                elif encoding is None:
+                    # Another client could have been sent this compressed, so
+                    # caches must still key it on Accept-Encoding.
+                    await send(_with_vary(message))
+                else:
+                    # Hold the headers until the first body chunk shows
+                    # whether the response is big enough to compress.
+                    start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                response_start, start = start, None
+                if more_body or len(body) >= self.minimum_size:
+                    compress = compressor(encoding, self.level)
+                    if not more_body:
+                        body = compress.compress(body) + compress.flush()
+                        await send(_encoded_start(response_start, encoding, len(body)))
+                        await send({"type": "http.response.body", "body": body})
+                        return
+                    response_start = _encoded_start(response_start, encoding, None)
+                else:
+                    response_start = _with_vary(response_start)
+                await send(response_start)
+
+            if compress is None:
+                await send(message)
+                return
+            body = compress.compress(body)
+            if not more_body:
+                body += compress.flush()
+            if body or not more_body:
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _compressible(start) -> bool:
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        headers = {name.lower(): value for name, value in start.get("headers", [])}
+        if b"content-encoding" in headers:
+            return False
+        # Event streams must reach the client as they are written.
+        return not headers.get(b"content-type", b"").startswith(b"text/event-stream")
+
+
+def _with_vary(start):
+    headers = []
+    vary = None
+    for name, value in start.get("headers", []):
+        if name.lower() == b"vary":
+            vary = value
+            continue
+        headers.append((name, value))
+    if vary is None:
+        vary = b"Accept-Encoding"
+    elif b"accept-encoding" not in vary.lower() and vary.strip() != b"*":
+        vary += b", Accept-Encoding"
+    headers.append((b"vary", vary))
+    return {**start, "headers": headers}
+
+
+def _encoded_start(start, encoding: str, content_length: int | None):
+    headers = []
+    for name, value in _with_vary(start)["headers"]:
+        lower = name.lower()
+        if lower == b"content-length":
+            continue
+        if lower == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        headers.append((name, value))
+    headers.append((b"content-encoding", encoding.encode("latin-1")))
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode("latin-1")))
+    return {**start, "headers": headers}
@@ -0,0 +1,35 @@
+import time
+from app.core.metrics import http_request_duration, http_requests_in_flight
+
+class MetricsMiddleware:
+    """Records latency per route template and the number of in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            # The router stores the matched route on the scope; unmatched
+            # paths share one label so clients cannot grow the series count.
+            route = scope.get("route")
+            template = getattr(route, "path", "unmatched")
+            http_request_duration.observe(
+                time.perf_counter() - start, scope["method"], template, str(status_code)
+            )
@@ -0,0 +1,92 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _LITERALS.sub("?", statement)
+    return _PARAM_LISTS.sub("(?)", statement)
+
+
+class QueryProfile:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+
+_current_profile: ContextVar[QueryProfile | None] = ContextVar("query_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_profile.get() is not None:
+        context._profile_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    start = getattr(context, "_profile_start", None)
+    if profile is None or start is None:
+        return
+    profile.count += 1
+    profile.seconds += time.perf_counter() - start
+    profile.statements[normalize_statement(statement)] += 1
+
+
+def install_query_profiler(*engines):
+    """Attach the statement listeners; only called when profiling is enabled."""
+    for async_engine in {id(e): e for e in engines}.values():
+        event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(async_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryProfilerMiddleware:
+    """Counts and times the SQL issued while handling each request.
+
+    Statements run by the request's sessions (get_db, get_read_db and the
+    task shard sessions) are attributed through a context variable, reported
+    as X-DB-Query-Count and X-DB-Time-Ms, and a warning is logged when one
+    normalized statement repeats more than repeat_threshold times, the usual
+    sign of an N+1.
+    """
+
+    def __init__(self, app, repeat_threshold: int = 5):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(profile.count).encode()))
+                headers.append((b"x-db-time-ms", f"{profile.seconds * 1000:.2f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            for statement, count in profile.statements.items():
+                if count > self.repeat_threshold:
+                    logger.warning(
+                        "%s %s ran %d times: %s",
+                        scope["method"], scope["path"], count, statement
+                    )
@@ -1,7 +1,8 @@
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
+from sqlalchemy import create_engine, engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.engine import make_url
 
 from alembic import context
 
@@ -20,6 +21,12 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 from app.models.user import User
 from app.models.task import Task  # if exists
+from app.models.task_stats import TaskStatusCount
+from app.models.task_version import TaskVersion
+from app.models.archived_task import ArchivedTask
+from app.models.task_sync_state import TaskSyncState, TaskSyncCompaction
+from app.models.task_job import TaskJob
+from app.core.config import settings
 from app.core.database import Base
 target_metadata = Base.metadata
 
@@ -29,6 +36,14 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # tasks_fts and its shadow tables are created by raw FTS5 DDL and are not
+    # in the metadata; without this autogenerate would drop the search index.
+    if type_ == "table" and name.startswith("tasks_fts"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -47,6 +62,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -65,10 +81,22 @@ def run_migrations_online() -> None:
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
+    _run_migrations(connectable)
+
+    # Every task shard gets the same schema and is kept at the same revision;
+    # only its task tables are used.
+    for url in settings.TASK_SHARD_URLS:
+        url = make_url(url)
+        shard = create_engine(url.set(drivername=url.get_backend_name()), poolclass=pool.NullPool)
+        _run_migrations(shard)
+
 
+def _run_migrations(connectable) -> None:
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
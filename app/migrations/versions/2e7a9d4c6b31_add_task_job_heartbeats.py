@@ -0,0 +1,31 @@
+"""add task job heartbeats
+
+Revision ID: 2e7a9d4c6b31
+Revises: 5d0c3b8f7e16
+Create Date: 2026-10-18 22:31:52.640117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7a9d4c6b31'
+down_revision: Union[str, Sequence[str], None] = '5d0c3b8f7e16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Jobs already running have no heartbeat and count as stale.
+    op.add_column('task_jobs', sa.Column('owner', sa.String(), nullable=True))
+    op.add_column('task_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('task_jobs', 'heartbeat_at')
+    op.drop_column('task_jobs', 'owner')
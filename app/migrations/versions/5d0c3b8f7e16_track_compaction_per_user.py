@@ -0,0 +1,48 @@
+"""track compaction per user
+
+Revision ID: 5d0c3b8f7e16
+Revises: 9b3f6e2a1c58
+Create Date: 2026-10-18 22:04:13.218640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0c3b8f7e16'
+down_revision: Union[str, Sequence[str], None] = '9b3f6e2a1c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_sync_compactions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('compacted_seq', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    # The old global mark doesn't say whose tombstones were compacted, so
+    # every user inherits it; cursors taken after it stay valid.
+    op.execute("""
+        INSERT INTO task_sync_compactions(user_id, compacted_seq)
+        SELECT users.id, task_sync_state.compacted_seq
+        FROM users, task_sync_state
+        WHERE task_sync_state.id = 1 AND task_sync_state.compacted_seq > 0
+    """)
+    op.drop_column('task_sync_state', 'compacted_seq')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('task_sync_state', sa.Column('compacted_seq', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE task_sync_state
+        SET compacted_seq = (SELECT COALESCE(MAX(compacted_seq), 0) FROM task_sync_compactions)
+        WHERE id = 1
+    """)
+    op.drop_table('task_sync_compactions')
@@ -0,0 +1,62 @@
+"""count archived tasks in stats
+
+Revision ID: 9b3f6e2a1c58
+Revises: 4a8e1c7d2b95
+Create Date: 2026-10-18 21:10:47.532918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f6e2a1c58'
+down_revision: Union[str, Sequence[str], None] = '4a8e1c7d2b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recount(include_archived: bool) -> None:
+    archived = "UNION ALL SELECT user_id, status FROM archived_tasks" if include_archived else ""
+    op.execute("DELETE FROM task_status_counts")
+    op.execute(f"""
+        INSERT INTO task_status_counts (user_id, status, count)
+        SELECT user_id, status, COUNT(*)
+        FROM (
+            SELECT user_id, status FROM tasks WHERE deleted_at IS NULL
+            {archived}
+        )
+        WHERE user_id IS NOT NULL AND status IS NOT NULL
+        GROUP BY user_id, status
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Moving a task to archived_tasks no longer takes it out of the counters.
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_ad")
+    op.execute("""
+        CREATE TRIGGER task_status_counts_ad AFTER DELETE ON tasks
+        WHEN old.deleted_at IS NULL
+        AND NOT EXISTS (SELECT 1 FROM archived_tasks WHERE id = old.id) BEGIN
+            UPDATE task_status_counts SET count = count - 1
+            WHERE user_id = old.user_id AND status = old.status;
+        END
+    """)
+    # Tasks archived before this revision were subtracted; count them again.
+    _recount(include_archived=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_ad")
+    op.execute("""
+        CREATE TRIGGER task_status_counts_ad AFTER DELETE ON tasks
+        WHEN old.deleted_at IS NULL BEGIN
+            UPDATE task_status_counts SET count = count - 1
+            WHERE user_id = old.user_id AND status = old.status;
+        END
+    """)
+    _recount(include_archived=False)
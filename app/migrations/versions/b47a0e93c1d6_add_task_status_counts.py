@@ -0,0 +1,73 @@
+"""add task status counts
+
+Revision ID: b47a0e93c1d6
+Revises: 8c2e4d61a9f3
+Create Date: 2026-10-18 13:05:27.449812
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47a0e93c1d6'
+down_revision: Union[str, Sequence[str], None] = '8c2e4d61a9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_tasks_user_id_status',
+        'tasks',
+        ['user_id', 'status', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+    op.create_table('task_status_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'status')
+    )
+    op.execute("""
+        CREATE TRIGGER task_status_counts_ai AFTER INSERT ON tasks BEGIN
+            INSERT INTO task_status_counts(user_id, status, count)
+            VALUES (new.user_id, new.status, 1)
+            ON CONFLICT(user_id, status) DO UPDATE SET count = count + 1;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER task_status_counts_ad AFTER DELETE ON tasks BEGIN
+            UPDATE task_status_counts SET count = count - 1
+            WHERE user_id = old.user_id AND status = old.status;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER task_status_counts_au AFTER UPDATE OF status, user_id ON tasks
+        WHEN old.status IS NOT new.status OR old.user_id IS NOT new.user_id BEGIN
+            UPDATE task_status_counts SET count = count - 1
+            WHERE user_id = old.user_id AND status = old.status;
+            INSERT INTO task_status_counts(user_id, status, count)
+            VALUES (new.user_id, new.status, 1)
+            ON CONFLICT(user_id, status) DO UPDATE SET count = count + 1;
+        END
+    """)
+    op.execute("""
+        INSERT INTO task_status_counts(user_id, status, count)
+        SELECT user_id, status, COUNT(*) FROM tasks
+        WHERE user_id IS NOT NULL AND status IS NOT NULL
+        GROUP BY user_id, status
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_au")
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_ad")
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_ai")
+    op.drop_table('task_status_counts')
+    op.drop_index('ix_tasks_user_id_status', table_name='tasks')
@@ -0,0 +1,58 @@
+"""add task versions
+
+Revision ID: c91f5b2d7e48
+Revises: b47a0e93c1d6
+Create Date: 2026-10-18 14:22:53.106377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c91f5b2d7e48'
+down_revision: Union[str, Sequence[str], None] = 'b47a0e93c1d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute("""
+        CREATE TRIGGER task_versions_ai AFTER INSERT ON tasks BEGIN
+            INSERT INTO task_versions(user_id, version) VALUES (new.user_id, 1)
+            ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER task_versions_au AFTER UPDATE ON tasks BEGIN
+            INSERT INTO task_versions(user_id, version) VALUES (new.user_id, 1)
+            ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER task_versions_ad AFTER DELETE ON tasks BEGIN
+            INSERT INTO task_versions(user_id, version) VALUES (old.user_id, 1)
+            ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+        END
+    """)
+    op.execute("""
+        INSERT INTO task_versions(user_id, version)
+        SELECT DISTINCT user_id, 1 FROM tasks WHERE user_id IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS task_versions_ad")
+    op.execute("DROP TRIGGER IF EXISTS task_versions_au")
+    op.execute("DROP TRIGGER IF EXISTS task_versions_ai")
+    op.drop_table('task_versions')
@@ -0,0 +1,53 @@
+"""add archived tasks
+
+Revision ID: e3a7c5d90b14
+Revises: c91f5b2d7e48
+Create Date: 2026-10-18 16:05:12.448310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c5d90b14'
+down_revision: Union[str, Sequence[str], None] = 'c91f5b2d7e48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('archived_tasks',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_archived_tasks_user_id_created_at_id',
+        'archived_tasks',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+    op.create_index(
+        'ix_tasks_completed_created_at',
+        'tasks',
+        ['created_at'],
+        unique=False,
+        sqlite_where=sa.text("status = 'completed'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_completed_created_at', table_name='tasks')
+    op.drop_index('ix_archived_tasks_user_id_created_at_id', table_name='archived_tasks')
+    op.drop_table('archived_tasks')
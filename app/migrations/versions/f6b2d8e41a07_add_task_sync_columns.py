@@ -0,0 +1,104 @@
+"""add task sync columns
+
+Revision ID: f6b2d8e41a07
+Revises: e3a7c5d90b14
+Create Date: 2026-10-18 18:41:27.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b2d8e41a07'
+down_revision: Union[str, Sequence[str], None] = 'e3a7c5d90b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('tasks', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('tasks', sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('archived_tasks', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_table('task_sync_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('compacted_seq', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # Existing rows: unchanged since creation, each with its own sequence
+    # number, and the counter continues after the highest one.
+    op.execute("UPDATE tasks SET updated_at = created_at, change_seq = id")
+    op.execute("UPDATE archived_tasks SET updated_at = created_at")
+    op.execute("""
+        INSERT INTO task_sync_state(id, seq, compacted_seq)
+        SELECT 1, COALESCE(MAX(id), 0) + 1, 0 FROM tasks
+    """)
+
+    op.create_index('ix_tasks_user_id_change_seq_id', 'tasks', ['user_id', 'change_seq', 'id'], unique=False)
+    op.create_index(
+        'ix_tasks_deleted_at',
+        'tasks',
+        ['deleted_at'],
+        unique=False,
+        sqlite_where=sa.text('deleted_at IS NOT NULL')
+    )
+
+    op.execute("""
+        CREATE TRIGGER task_sync_state_ai AFTER INSERT ON tasks BEGIN
+            UPDATE task_sync_state SET seq = seq + 1 WHERE id = 1;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER task_sync_state_au AFTER UPDATE ON tasks BEGIN
+            UPDATE task_sync_state SET seq = seq + 1 WHERE id = 1;
+        END
+    """)
+
+    # Tombstones leave the status counters when they are created, so purging
+    # them later must not decrement again.
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_ad")
+    op.execute("""
+        CREATE TRIGGER task_status_counts_ad AFTER DELETE ON tasks
+        WHEN old.deleted_at IS NULL BEGIN
+            UPDATE task_status_counts SET count = count - 1
+            WHERE user_id = old.user_id AND status = old.status;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER task_status_counts_sd AFTER UPDATE OF deleted_at ON tasks
+        WHEN old.deleted_at IS NULL AND new.deleted_at IS NOT NULL BEGIN
+            UPDATE task_status_counts SET count = count - 1
+            WHERE user_id = old.user_id AND status = old.status;
+        END
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Tombstones would come back to life without deleted_at; purge them.
+    op.execute("DELETE FROM tasks WHERE deleted_at IS NOT NULL")
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_sd")
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_ad")
+    op.execute("""
+        CREATE TRIGGER task_status_counts_ad AFTER DELETE ON tasks BEGIN
+            UPDATE task_status_counts SET count = count - 1
+            WHERE user_id = old.user_id AND status = old.status;
+        END
+    """)
+    op.execute("DROP TRIGGER IF EXISTS task_sync_state_au")
+    op.execute("DROP TRIGGER IF EXISTS task_sync_state_ai")
+    op.drop_index('ix_tasks_deleted_at', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_change_seq_id', table_name='tasks')
+    op.drop_table('task_sync_state')
+    # Plain DROP COLUMN (SQLite 3.35+): a batch table rebuild would drop
+    # every trigger on tasks.
+    op.drop_column('archived_tasks', 'updated_at')
+    op.drop_column('tasks', 'change_seq')
+    op.drop_column('tasks', 'deleted_at')
+    op.drop_column('tasks', 'updated_at')
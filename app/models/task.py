@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Index, DDL, event, select
+from sqlalchemy.sql import func, table, column
 from app.core.database import Base
+from app.models.task_sync_state import TaskSyncState
 from app.util.enum import TaskStatus
 
+_current_change_seq = select(TaskSyncState.seq).where(TaskSyncState.id == 1).scalar_subquery()
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -12,3 +15,69 @@ class Task(Base):
     status = Column(String, default=TaskStatus.pending.value)
     user_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # SQL-side defaults rather than server defaults: SQLite cannot add a
+    # column with a non-constant default to an existing table.
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+    # Set on soft delete; the row stays as a tombstone for delta sync.
+    deleted_at = Column(DateTime(timezone=True))
+    change_seq = Column(
+        Integer,
+        nullable=False,
+        server_default="0",
+        default=_current_change_seq,
+        onupdate=_current_change_seq
+    )
+
+    __table_args__ = (
+        Index("ix_tasks_user_id_created_at_id", user_id, created_at.desc(), id.desc()),
+        Index("ix_tasks_user_id_status", user_id, status, created_at.desc(), id.desc()),
+        # Only completed tasks are archive candidates; keeps the archiver's
+        # scan off the rest of the table.
+        Index(
+            "ix_tasks_completed_created_at",
+            created_at,
+            sqlite_where=status == TaskStatus.completed.value
+        ),
+        Index("ix_tasks_user_id_change_seq_id", user_id, change_seq, id),
+        Index("ix_tasks_deleted_at", deleted_at, sqlite_where=deleted_at.is_not(None)),
+    )
+
+# External-content FTS5 index over tasks, kept in sync by triggers. The
+# migration creates the same objects; these hooks cover metadata.create_all.
+tasks_fts = table("tasks_fts", column("rowid"), column("title"), column("description"))
+
+TASKS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+for statement in TASKS_FTS_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite")
+)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.util.enum import TaskJobStatus
+
+class TaskJob(Base):
+    __tablename__ = "task_jobs"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    kind = Column(String, nullable=False)
+    params = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default=TaskJobStatus.queued.value)
+    processed = Column(Integer, nullable=False, default=0)
+    total = Column(Integer)
+    error = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    # The runner working on the job, and when it last reported progress.
+    owner = Column(String)
+    heartbeat_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Workers claim the oldest queued job.
+        Index("ix_task_jobs_status_id", status, id),
+        Index("ix_task_jobs_user_id_status", user_id, status),
+    )
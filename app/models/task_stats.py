@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DDL, event
+from app.core.database import Base
+
+class TaskStatusCount(Base):
+    __tablename__ = "task_status_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+# Counters are maintained by triggers on tasks, so every write path updates
+# them in the writer's own transaction. Tombstones (deleted_at set) are not
+# counted. Archived tasks still are: the archiver copies a row to
+# archived_tasks before deleting it, and that delete leaves the counter alone.
+# The migrations create the same triggers; these hooks cover
+# metadata.create_all.
+TASK_STATUS_COUNT_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_status_counts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_status_counts(user_id, status, count)
+        VALUES (new.user_id, new.status, 1)
+        ON CONFLICT(user_id, status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_status_counts_ad AFTER DELETE ON tasks
+    WHEN old.deleted_at IS NULL
+    AND NOT EXISTS (SELECT 1 FROM archived_tasks WHERE id = old.id) BEGIN
+        UPDATE task_status_counts SET count = count - 1
+        WHERE user_id = old.user_id AND status = old.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_status_counts_sd AFTER UPDATE OF deleted_at ON tasks
+    WHEN old.deleted_at IS NULL AND new.deleted_at IS NOT NULL BEGIN
+        UPDATE task_status_counts SET count = count - 1
+        WHERE user_id = old.user_id AND status = old.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_status_counts_au AFTER UPDATE OF status, user_id ON tasks
+    WHEN old.status IS NOT new.status OR old.user_id IS NOT new.user_id BEGIN
+        UPDATE task_status_counts SET count = count - 1
+        WHERE user_id = old.user_id AND status = old.status;
+        INSERT INTO task_status_counts(user_id, status, count)
+        VALUES (new.user_id, new.status, 1)
+        ON CONFLICT(user_id, status) DO UPDATE SET count = count + 1;
+    END
+    """,
+]
+
+for statement in TASK_STATUS_COUNT_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
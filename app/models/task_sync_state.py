@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Integer, ForeignKey, DDL, event
+from app.core.database import Base
+
+class TaskSyncState(Base):
+    __tablename__ = "task_sync_state"
+
+    id = Column(Integer, primary_key=True)
+    # Next change sequence number to hand out.
+    seq = Column(Integer, nullable=False, default=1)
+
+class TaskSyncCompaction(Base):
+    __tablename__ = "task_sync_compactions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # Highest change_seq of the user's compacted tombstones. A sync cursor of
+    # that user below it may have missed a delete. Kept per user, so compacting
+    # one user's tombstones doesn't expire everyone else's cursors.
+    compacted_seq = Column(Integer, nullable=False, default=0)
+
+# One row, bumped by triggers after every insert and update of tasks. A write
+# stamps its rows with the current value (Task.change_seq), so every later
+# statement gets a strictly higher number, even across users and deletes.
+# The migration creates the same row and triggers; these hooks cover
+# metadata.create_all.
+TASK_SYNC_STATE_DDL = [
+    """
+    INSERT OR IGNORE INTO task_sync_state(id, seq) VALUES (1, 1)
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_sync_state_ai AFTER INSERT ON tasks BEGIN
+        UPDATE task_sync_state SET seq = seq + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_sync_state_au AFTER UPDATE ON tasks BEGIN
+        UPDATE task_sync_state SET seq = seq + 1 WHERE id = 1;
+    END
+    """,
+]
+
+for statement in TASK_SYNC_STATE_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, ForeignKey, DDL, event
+from app.core.database import Base
+
+class TaskVersion(Base):
+    __tablename__ = "task_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+# Bumped by triggers on every insert, update and delete of a user's tasks,
+# in the same transaction as the write. The migration creates the same
+# triggers; these hooks cover metadata.create_all.
+TASK_VERSION_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_versions_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_versions(user_id, version) VALUES (new.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_versions_au AFTER UPDATE ON tasks BEGIN
+        INSERT INTO task_versions(user_id, version) VALUES (new.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_versions_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO task_versions(user_id, version) VALUES (old.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+    END
+    """,
+]
+
+for statement in TASK_VERSION_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
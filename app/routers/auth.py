@@ -4,6 +4,7 @@ from jose import jwt
 from datetime import datetime, timedelta
 
 from app.core.config import settings
+from app.dependencies.admission import auth_admission
 from app.dependencies.db import get_db
 from app.schemas.user import UserCreate, UserLogin, UserResponse
 from app.schemas.token import Token
@@ -18,12 +19,12 @@ def create_access_token(data: dict):
 
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-@router.post("/register", response_model=UserResponse)
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(auth_admission)])
 async def register_user(data: UserCreate, db: AsyncSession = Depends(get_db)):
     user = await UserService.create_user(db, data)
     return user
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(auth_admission)])
 async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
     user = await UserService.authenticate_user(db, data.email, data.password)
 
@@ -1,52 +1,306 @@
-from fastapi import APIRouter, Depends
-from app.schemas.task import TaskResponse, TaskCreate, TaskUpdate
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi import status as http_status
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import UploadFile
+from app.schemas.task import (
+    TaskResponse,
+    TaskCreate,
+    TaskUpdate,
+    TaskBulkUpdateItem,
+    TaskBulkDelete,
+    TaskBulkResult,
+    TaskStats,
+    TaskChanges,
+    TaskImportResult,
+    TaskJobCreate,
+    TaskJobResponse,
+    task_rows_adapter,
+    task_fields,
+    task_fields_adapter,
+    task_columns_adapter,
+    TASK_FIELDS,
+    TASK_FIELDS_PATTERN,
+    TASKS_COLUMNAR_MEDIA_TYPE,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.dependencies.auth import get_current_user
-from app.dependencies.db import get_db
-from app.models.user import User
+from app.dependencies.shard import get_task_db, get_task_read_db
+from app.core.cache import Principal
+from app.core.events import task_events
 from app.services.task_service import Taskservice
+from app.services.task_batcher import task_create_batcher
+from app.services.task_jobs import TaskJobService, task_job_runner
+from app.util.enum import TaskStatus
+from app.util.etag import make_etag, etag_matches
+from app.util.media_type import choose_media_type
+from app.util.export import csv_chunks, ndjson_chunks
+from app.util.task_import import csv_records, iter_lines, ndjson_records, upload_chunks
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 @router.post("/", response_model=TaskResponse)
 async def create_task(
     data: TaskCreate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_task_db),
+    current_user: Principal = Depends(get_current_user)
 ):
+    if settings.TASKS_GROUP_COMMIT_ENABLED:
+        return await task_create_batcher.create(db, current_user.id, data)
     return await Taskservice.create_task(db, current_user.id, data)
 
 @router.get("/", response_model=list[TaskResponse])
 async def list_tasks(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.TASKS_PAGE_SIZE, ge=1, le=settings.TASKS_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    status: TaskStatus | None = None,
+    include_archived: bool = False,
+    fields: str | None = Query(None, pattern=TASK_FIELDS_PATTERN),
+    accept: str | None = Header(None),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_task_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    return await Taskservice.get_user_tasks(db, current_user.id)
+    columnar = accept is not None and choose_media_type(
+        accept, ["application/json", TASKS_COLUMNAR_MEDIA_TYPE]
+    ) == TASKS_COLUMNAR_MEDIA_TYPE
+    version = await Taskservice.get_tasks_version(db, current_user.id)
+    etag = make_etag(version, current_user.id, request.url.path, request.url.query, columnar)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept"})
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = "Accept"
+
+    projection = task_fields(fields) if fields is not None else None
+    tasks, next_cursor = await Taskservice.get_user_tasks(
+        db,
+        current_user.id,
+        limit,
+        cursor,
+        status,
+        as_rows=settings.TASKS_FAST_JSON or columnar,
+        include_archived=include_archived,
+        fields=projection
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if columnar:
+        names = projection or TASK_FIELDS
+        return Response(
+            content=task_columns_adapter(names).dump_json(
+                {name: [getattr(row, name) for row in tasks] for name in names}
+            ),
+            media_type=TASKS_COLUMNAR_MEDIA_TYPE,
+            headers=dict(response.headers)
+        )
+    if projection is not None:
+        return Response(
+            content=task_fields_adapter(projection, many=True).dump_json(
+                [row._asdict() for row in tasks]
+            ),
+            media_type="application/json",
+            headers=dict(response.headers)
+        )
+    if settings.TASKS_FAST_JSON:
+        return Response(
+            content=task_rows_adapter.dump_json([row._asdict() for row in tasks]),
+            media_type="application/json",
+            headers=dict(response.headers)
+        )
+    return tasks
+
+@router.get("/stats", response_model=TaskStats)
+async def get_task_stats(
+    db: AsyncSession = Depends(get_task_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    return await Taskservice.get_task_stats(db, current_user.id)
+
+@router.get("/search", response_model=list[TaskResponse])
+async def search_tasks(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(settings.TASKS_PAGE_SIZE, ge=1, le=settings.TASKS_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_task_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    return await Taskservice.search_tasks(db, current_user.id, q, limit, offset)
+
+@router.get("/events")
+async def task_event_stream(current_user: Principal = Depends(get_current_user)):
+    if not task_events.has_capacity(current_user.id):
+        raise HTTPException(
+            status_code=http_status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many open event streams"
+        )
+    return StreamingResponse(
+        task_events.stream(current_user.id, settings.TASK_EVENTS_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/changes", response_model=TaskChanges)
+async def get_task_changes(
+    since: str | None = None,
+    limit: int = Query(settings.TASKS_CHANGES_PAGE_SIZE, ge=1, le=settings.TASKS_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_task_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    return await Taskservice.get_task_changes(db, current_user.id, limit, since)
+
+@router.get("/export")
+async def export_tasks(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_task_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    partitions = Taskservice.stream_user_tasks(db, current_user.id, settings.TASKS_EXPORT_CHUNK_SIZE)
+    if export_format == "csv":
+        content, media_type = csv_chunks(partitions), "text/csv"
+    else:
+        content, media_type = ndjson_chunks(partitions), "application/x-ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format}"'}
+    )
+
+@router.post("/import", response_model=TaskImportResult)
+async def import_tasks(
+    request: Request,
+    import_format: str | None = Query(None, alias="format", pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_task_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    # Either a multipart upload in a "file" field, which Starlette spools to
+    # a temporary file, or the raw body, read as it arrives. request.form()
+    # yields Starlette's UploadFile, not FastAPI's subclass.
+    form = None
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail='Expected a "file" upload'
+            )
+        chunks = upload_chunks(upload)
+        content_type = f"{upload.content_type} {upload.filename}"
+    else:
+        chunks = request.stream()
+
+    if import_format is None:
+        import_format = "csv" if "csv" in content_type else "ndjson"
+    lines = iter_lines(chunks, settings.TASKS_IMPORT_MAX_LINE_BYTES)
+    if import_format == "csv":
+        records = csv_records(lines, settings.TASKS_IMPORT_MAX_LINE_BYTES)
+    else:
+        records = ndjson_records(lines)
+
+    try:
+        return await Taskservice.import_tasks(
+            db,
+            current_user.id,
+            records,
+            settings.TASKS_IMPORT_BATCH_SIZE,
+            settings.TASKS_IMPORT_MAX_ERRORS
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail="Body is not valid UTF-8"
+        )
+    finally:
+        if form is not None:
+            await form.close()
+
+@router.post("/jobs", response_model=TaskJobResponse, status_code=http_status.HTTP_202_ACCEPTED)
+async def submit_task_job(
+    data: TaskJobCreate,
+    db: AsyncSession = Depends(get_task_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    job = await TaskJobService.submit_job(db, current_user.id, data)
+    task_job_runner.wake()
+    return job
+
+@router.get("/jobs/{job_id}", response_model=TaskJobResponse)
+async def get_task_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_task_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    return await TaskJobService.get_job(db, job_id, current_user.id)
+
+@router.post("/bulk", response_model=list[TaskBulkResult])
+async def bulk_create_tasks(
+    data: list[TaskCreate],
+    db: AsyncSession = Depends(get_task_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    return await Taskservice.bulk_create_tasks(db, current_user.id, data)
+
+@router.patch("/bulk", response_model=list[TaskBulkResult])
+async def bulk_update_tasks(
+    data: list[TaskBulkUpdateItem],
+    db: AsyncSession = Depends(get_task_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    return await Taskservice.bulk_update_tasks(db, current_user.id, data)
+
+@router.delete("/bulk", response_model=list[TaskBulkResult])
+async def bulk_delete_tasks(
+    data: TaskBulkDelete,
+    db: AsyncSession = Depends(get_task_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    return await Taskservice.bulk_delete_tasks(db, current_user.id, data.ids)
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    fields: str | None = Query(None, pattern=TASK_FIELDS_PATTERN),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_task_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    return await Taskservice.get_task(db, task_id, current_user.id)
+    projection = task_fields(fields) if fields is not None else None
+    version = await Taskservice.get_tasks_version(db, current_user.id)
+    etag = make_etag(version, current_user.id, task_id, projection)
+    if etag_matches(if_none_match, etag):
+        # The tag only covers the user's version, so `*` or a made-up tag
+        # would match ids that don't exist; confirm the task first (404s).
+        await Taskservice.get_task(db, task_id, current_user.id, ("id",))
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    task = await Taskservice.get_task(db, task_id, current_user.id, projection)
+    if projection is not None:
+        return Response(
+            content=task_fields_adapter(projection).dump_json(task._asdict()),
+            media_type="application/json",
+            headers=dict(response.headers)
+        )
+    return task
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     data: TaskUpdate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_task_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    task = await Taskservice.get_task(db, task_id, current_user.id)
-    return await Taskservice.update_task(db, task, data)
+    return await Taskservice.update_task(db, task_id, current_user.id, data)
 
 @router.delete("/{task_id}")    
 async def delete_task(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_task_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    task = await Taskservice.get_task(db, task_id, current_user.id)
-    await Taskservice.delete_task(db, task)
+    await Taskservice.delete_task(db, task_id, current_user.id)
     return {"message": "Task deleted successfully"}
\ No newline at end of file
@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends
 from app.schemas.user import UserResponse
-from app.models.user import User
+from app.core.cache import Principal
 from app.dependencies.auth import get_current_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: Principal = Depends(get_current_user)):
     return current_user
\ No newline at end of file
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, field_validator
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter, field_validator, model_validator
 from typing import Optional
-from app.util.enum import TaskStatus
+from typing_extensions import TypedDict
+from app.util.enum import TaskJobKind, TaskStatus
 from datetime import datetime
 
 class TaskCreate(BaseModel):
@@ -33,6 +35,125 @@ class TaskResponse(BaseModel):
     status: str 
     user_id: int
     created_at: datetime    
+    updated_at: datetime | None = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class TaskRow(TypedDict):
+    id: int
+    title: str
+    description: str | None
+    status: str
+    user_id: int
+    created_at: datetime
+    updated_at: datetime | None
+
+
+# Serializes plain row dicts straight to JSON with the same keys and
+# encoding as TaskResponse, skipping per-row model validation.
+task_rows_adapter = TypeAdapter(list[TaskRow])
+task_row_adapter = TypeAdapter(TaskRow)
+
+TASK_FIELDS = tuple(TaskRow.__annotations__)
+TASK_FIELDS_PATTERN = "^({0})(,({0}))*$".format("|".join(TASK_FIELDS))
+
+
+def task_fields(value: str) -> tuple[str, ...]:
+    # Canonical order and no duplicates, so equal selections share an adapter.
+    requested = set(value.split(","))
+    return tuple(name for name in TASK_FIELDS if name in requested)
+
+
+@lru_cache(maxsize=256)
+def task_fields_adapter(fields: tuple[str, ...], many: bool = False) -> TypeAdapter:
+    # Response model for a ?fields= projection: TaskRow cut down to those keys.
+    # Keys a row has beyond them are left out of the output.
+    row = TypedDict("TaskFields", {name: TaskRow.__annotations__[name] for name in fields})
+    return TypeAdapter(list[row] if many else row)
+
+
+TASKS_COLUMNAR_MEDIA_TYPE = "application/vnd.tasks.columnar+json"
+
+
+@lru_cache(maxsize=256)
+def task_columns_adapter(fields: tuple[str, ...]) -> TypeAdapter:
+    # Columnar layout: one array per field instead of one object per task,
+    # so each key is sent once per page rather than once per row.
+    columns = TypedDict(
+        "TaskColumns", {name: list[TaskRow.__annotations__[name]] for name in fields}
+    )
+    return TypeAdapter(columns)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBulkDelete(BaseModel):
+    ids: list[int]
+
+
+class TaskBulkResult(BaseModel):
+    id: int
+    status: str
+    task: Optional[TaskResponse] = None
+
+
+class TaskImportError(BaseModel):
+    line: int
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[TaskImportError]
+
+
+class TaskChange(BaseModel):
+    id: int
+    deleted: bool
+    task: Optional[TaskResponse] = None
+
+
+class TaskChanges(BaseModel):
+    changes: list[TaskChange]
+    cursor: str
+    has_more: bool
+
+
+class TaskJobCreate(BaseModel):
+    kind: TaskJobKind
+    # Only tasks with this status; all tasks when omitted.
+    status: Optional[TaskStatus] = None
+    new_status: Optional[TaskStatus] = None
+
+    @model_validator(mode="after")
+    def new_status_for_updates(self):
+        if self.kind == TaskJobKind.update_status and self.new_status is None:
+            raise ValueError("new_status is required for update_status jobs")
+        return self
+
+
+class TaskJobResponse(BaseModel):
+    id: int
+    kind: str
+    params: dict
+    status: str
+    processed: int
+    total: int | None
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    class Config:
+        from_attributes = True
+
+
+class TaskStats(BaseModel):
+    pending: int = 0
+    completed: int = 0
+    total: int = 0
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.core.database import async_session_local, shard_session_locals
+from app.services.task_service import Taskservice
+
+logger = logging.getLogger(__name__)
+
+class TaskArchiver:
+    """Moves completed tasks older than TASKS_ARCHIVE_AFTER_DAYS to archived_tasks.
+
+    Each chunk of TASKS_ARCHIVE_BATCH_SIZE tasks is its own short transaction,
+    with a pause in between, so the archiver never holds SQLite's writer lock
+    for long and request writes can interleave with it.
+    """
+
+    @staticmethod
+    async def archive_once() -> int:
+        older_than = datetime.now(timezone.utc) - timedelta(days=settings.TASKS_ARCHIVE_AFTER_DAYS)
+        total = 0
+        for session_factory in shard_session_locals or [async_session_local]:
+            while True:
+                async with session_factory() as db:
+                    moved = await Taskservice.archive_completed_tasks(
+                        db, older_than, settings.TASKS_ARCHIVE_BATCH_SIZE
+                    )
+                total += moved
+                if moved < settings.TASKS_ARCHIVE_BATCH_SIZE:
+                    break
+                await asyncio.sleep(settings.TASKS_ARCHIVE_BATCH_PAUSE_SECONDS)
+        return total
+
+    @staticmethod
+    async def run_forever():
+        while True:
+            try:
+                moved = await TaskArchiver.archive_once()
+                if moved:
+                    logger.info("Archived %d completed tasks", moved)
+            except SQLAlchemyError:
+                logger.exception("Task archiving failed")
+            await asyncio.sleep(settings.TASKS_ARCHIVE_INTERVAL_SECONDS)
@@ -0,0 +1,127 @@
+import asyncio
+from dataclasses import dataclass
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.events import task_events
+from app.models.task import Task
+from app.schemas.task import TaskCreate
+from app.services.task_service import Taskservice
+
+
+@dataclass
+class _PendingCreate:
+    user_id: int
+    data: TaskCreate
+    future: asyncio.Future
+
+
+@dataclass
+class _Batch:
+    entries: list[_PendingCreate]
+    full: asyncio.Event
+
+
+class TaskCreateBatcher:
+    """Group commit for POST /tasks.
+
+    The first create to arrive becomes the leader: it waits up to window
+    seconds (or until max_batch creates are queued), then inserts the whole
+    batch with one executemany INSERT ... RETURNING and one commit on its own
+    session, and hands every follower its row. If the batch fails, the leader
+    retries each create in its own transaction so one bad row only fails its
+    own request. Creates are only batched with others bound to the same
+    database, so each shard gets its own batches.
+    """
+
+    def __init__(self, window_seconds: float, max_batch: int):
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._open: dict[object, _Batch] = {}
+
+    async def create(self, db: AsyncSession, user_id: int, data: TaskCreate):
+        entry = _PendingCreate(user_id, data, asyncio.get_running_loop().create_future())
+        key = db.get_bind()
+        batch = self._open.get(key)
+
+        if batch is None:
+            batch = self._open[key] = _Batch([entry], asyncio.Event())
+            await self._lead(db, key, batch)
+        else:
+            batch.entries.append(entry)
+            if len(batch.entries) >= self.max_batch:
+                self._close(key, batch)
+                batch.full.set()
+        return await entry.future
+
+    def _close(self, key, batch: _Batch):
+        # Creates arriving after this start a new batch with a new leader.
+        if self._open.get(key) is batch:
+            del self._open[key]
+
+    async def _lead(self, db: AsyncSession, key, batch: _Batch):
+        leader = batch.entries[0]
+        try:
+            if self.max_batch > 1:
+                try:
+                    await asyncio.wait_for(batch.full.wait(), self.window_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            self._close(key, batch)
+            await self._write(db, batch.entries)
+        except BaseException as exc:
+            # The leader's request was cancelled or its session broke; don't
+            # leave followers waiting on it.
+            self._close(key, batch)
+            if not isinstance(exc, Exception):
+                exc = HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Task batch was interrupted"
+                )
+            for entry in batch.entries:
+                if entry is not leader and not entry.future.done():
+                    entry.future.set_exception(exc)
+            raise
+
+    async def _write(self, db: AsyncSession, batch: list[_PendingCreate]):
+        stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+        params = [
+            {"title": entry.data.title, "description": entry.data.description, "user_id": entry.user_id}
+            for entry in batch
+        ]
+        try:
+            result = await db.scalars(stmt, params)
+            tasks = result.all()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            if len(batch) == 1:
+                raise
+            # Retry one by one so a bad row only fails its own request.
+            for entry in batch:
+                try:
+                    task = await Taskservice.create_task(db, entry.user_id, entry.data)
+                except Exception as exc:
+                    await db.rollback()
+                    if not entry.future.done():
+                        entry.future.set_exception(exc)
+                else:
+                    # A later rollback would expire it; detach it loaded.
+                    db.expunge(task)
+                    if not entry.future.done():
+                        entry.future.set_result(task)
+            return
+
+        for entry, task in zip(batch, tasks):
+            task_events.publish_tasks(entry.user_id, "created", [task])
+            # A follower whose request was cancelled (client gone) already
+            # has a cancelled future; its row is committed all the same.
+            if not entry.future.done():
+                entry.future.set_result(task)
+
+
+task_create_batcher = TaskCreateBatcher(
+    window_seconds=settings.TASKS_GROUP_COMMIT_WINDOW_MS / 1000,
+    max_batch=settings.TASKS_GROUP_COMMIT_MAX_BATCH
+)
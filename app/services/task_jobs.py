@@ -0,0 +1,261 @@
+import asyncio
+import logging
+import uuid
+from contextlib import suppress
+from fastapi import HTTPException, status
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import async_session_local, shard_session_locals
+from app.models.task_job import TaskJob
+from app.schemas.task import TaskJobCreate
+from app.services.task_service import Taskservice
+from app.util.enum import TaskJobKind, TaskJobStatus, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+_PENDING = (TaskJobStatus.queued.value, TaskJobStatus.running.value)
+
+
+def _job_not_found():
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Job not found"
+    )
+
+
+class TaskJobService:
+
+    @staticmethod
+    async def submit_job(db: AsyncSession, user_id: int, data: TaskJobCreate):
+        pending = await db.scalar(
+            select(func.count())
+            .select_from(TaskJob)
+            .where(TaskJob.user_id == user_id, TaskJob.status.in_(_PENDING))
+        )
+        if pending >= settings.TASK_JOBS_MAX_PENDING_PER_USER:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many pending jobs"
+            )
+        result = await db.scalars(
+            insert(TaskJob)
+            .values(
+                user_id=user_id,
+                kind=data.kind.value,
+                params=data.model_dump(mode="json", exclude={"kind"})
+            )
+            .returning(TaskJob)
+        )
+        job = result.one()
+        await db.commit()
+        return job
+
+    @staticmethod
+    async def get_job(db: AsyncSession, job_id: int, user_id: int):
+        job = await db.scalar(
+            select(TaskJob).where(TaskJob.id == job_id, TaskJob.user_id == user_id)
+        )
+        if job is None:
+            raise _job_not_found()
+        return job
+
+    @staticmethod
+    async def claim_next_job(db: AsyncSession, owner: str):
+        # Atomic claim: of several workers, only one moves a job to running.
+        oldest = (
+            select(TaskJob.id)
+            .where(TaskJob.status == TaskJobStatus.queued.value)
+            .order_by(TaskJob.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        result = await db.scalars(
+            update(TaskJob)
+            .where(TaskJob.id == oldest, TaskJob.status == TaskJobStatus.queued.value)
+            .values(
+                status=TaskJobStatus.running.value,
+                started_at=func.now(),
+                owner=owner,
+                heartbeat_at=func.now()
+            )
+            .returning(TaskJob)
+            .execution_options(synchronize_session=False)
+        )
+        job = result.first()
+        await db.commit()
+        return job
+
+    @staticmethod
+    async def requeue_interrupted_jobs(db: AsyncSession, stale_seconds: float):
+        # Jobs left running by a process that died: a live runner refreshes
+        # heartbeat_at after every batch, so only silent jobs are taken back.
+        # Every kind is idempotent and recounts its remaining rows, so running
+        # it again is safe.
+        stale_before = func.datetime(func.now(), f"-{stale_seconds} seconds")
+        result = await db.execute(
+            update(TaskJob)
+            .where(
+                TaskJob.status == TaskJobStatus.running.value,
+                (TaskJob.heartbeat_at.is_(None)) | (TaskJob.heartbeat_at < stale_before)
+            )
+            .values(status=TaskJobStatus.queued.value, owner=None, heartbeat_at=None)
+        )
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def release_job(db: AsyncSession, job_id: int, owner: str):
+        # Hands a job this runner was working on back to the queue.
+        await db.execute(
+            update(TaskJob)
+            .where(
+                TaskJob.id == job_id,
+                TaskJob.owner == owner,
+                TaskJob.status == TaskJobStatus.running.value
+            )
+            .values(status=TaskJobStatus.queued.value, owner=None, heartbeat_at=None)
+        )
+        await db.commit()
+
+    @staticmethod
+    async def run_job(db: AsyncSession, job: TaskJob):
+        batch_size = settings.TASK_JOBS_BATCH_SIZE
+        task_status = TaskStatus(job.params["status"]) if job.params.get("status") else None
+        try:
+            if job.kind == TaskJobKind.delete_tasks.value:
+                total = await Taskservice.count_user_tasks(db, job.user_id, task_status)
+
+                def step():
+                    return Taskservice.delete_tasks_batch(db, job.user_id, task_status, batch_size)
+            else:
+                new_status = TaskStatus(job.params["new_status"])
+                total = await Taskservice.count_user_tasks(
+                    db, job.user_id, task_status, exclude_status=new_status
+                )
+
+                def step():
+                    return Taskservice.update_status_batch(
+                        db, job.user_id, task_status, new_status, batch_size
+                    )
+
+            await TaskJobService._set(
+                db, job.id, total=total, processed=0, heartbeat_at=func.now()
+            )
+            while True:
+                done = await step()
+                await TaskJobService._set(
+                    db, job.id, processed=TaskJob.processed + done, heartbeat_at=func.now()
+                )
+                if done < batch_size:
+                    break
+                await asyncio.sleep(settings.TASK_JOBS_BATCH_PAUSE_SECONDS)
+        except Exception as exc:
+            # Any error fails the job rather than leaving it running under a
+            # live owner. CancelledError is not an Exception, so a stopping
+            # runner still requeues the job.
+            logger.exception("Task job %d failed", job.id)
+            await db.rollback()
+            await TaskJobService._set(
+                db,
+                job.id,
+                status=TaskJobStatus.failed.value,
+                error=str(exc)[:500],
+                finished_at=func.now()
+            )
+            return
+        await TaskJobService._set(
+            db, job.id, status=TaskJobStatus.succeeded.value, finished_at=func.now()
+        )
+
+    @staticmethod
+    async def _set(db: AsyncSession, job_id: int, **values):
+        await db.execute(update(TaskJob).where(TaskJob.id == job_id).values(**values))
+        await db.commit()
+
+
+class TaskJobRunner:
+    """Runs jobs from task_jobs on a fixed pool of asyncio workers.
+
+    The table is the queue: a worker claims the oldest queued job with one
+    atomic UPDATE, so jobs survive restarts and submitting one never blocks
+    a request. wake() starts idle workers right away; otherwise they check
+    every poll_seconds. Each job works through its rows in short
+    transactions of TASK_JOBS_BATCH_SIZE, committing its progress and a
+    heartbeat after each. stop() puts the jobs it interrupts back in the
+    queue; start() requeues only jobs whose heartbeat is older than
+    TASK_JOBS_STALE_SECONDS, since another live process may own the rest.
+    """
+
+    def __init__(self, session_factories, workers: int, poll_seconds: float):
+        self.session_factories = session_factories
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        # Identifies this runner's claims among other processes on the same
+        # database.
+        self.owner = uuid.uuid4().hex
+        # (session factory, job id) of the jobs being run right now.
+        self._running: set[tuple] = set()
+
+    async def start(self):
+        for session_factory in self.session_factories:
+            async with session_factory() as db:
+                await TaskJobService.requeue_interrupted_jobs(
+                    db, settings.TASK_JOBS_STALE_SECONDS
+                )
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for worker in self._tasks:
+            worker.cancel()
+        for worker in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await worker
+        self._tasks = []
+        for session_factory, job_id in self._running:
+            async with session_factory() as db:
+                await TaskJobService.release_job(db, job_id, self.owner)
+        self._running.clear()
+
+    def wake(self):
+        self._wake.set()
+
+    async def run_pending(self) -> int:
+        ran = 0
+        while await self._run_next():
+            ran += 1
+        return ran
+
+    async def _run_next(self) -> bool:
+        for session_factory in self.session_factories:
+            async with session_factory() as db:
+                job = await TaskJobService.claim_next_job(db, self.owner)
+                if job is not None:
+                    # Left in place if the worker is cancelled mid-job, so
+                    # stop() can requeue it.
+                    self._running.add((session_factory, job.id))
+                    await TaskJobService.run_job(db, job)
+                    self._running.discard((session_factory, job.id))
+                    return True
+        return False
+
+    async def _work(self):
+        while True:
+            self._wake.clear()
+            try:
+                if await self._run_next():
+                    continue
+            except Exception:
+                # Keep the worker alive; the next poll tries again.
+                logger.exception("Task job worker failed")
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+
+
+task_job_runner = TaskJobRunner(
+    session_factories=shard_session_locals or [async_session_local],
+    workers=settings.TASK_JOBS_WORKERS,
+    poll_seconds=settings.TASK_JOBS_POLL_SECONDS
+)
@@ -1,61 +1,633 @@
+import re
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.task import TaskCreate, TaskUpdate
-from app.models.task import Task
+from app.core.config import settings
+from app.core.events import task_events
+from app.schemas.task import TaskCreate, TaskUpdate, TaskBulkUpdateItem
+from app.models.task import Task, tasks_fts
+from app.models.archived_task import ArchivedTask
+from app.models.task_stats import TaskStatusCount
+from app.models.task_version import TaskVersion
+from app.models.task_sync_state import TaskSyncCompaction
+from app.util.enum import TaskStatus
+from app.util.pagination import encode_cursor, decode_cursor, encode_change_cursor, decode_change_cursor
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import String, bindparam, delete, func, insert, literal, literal_column, text, tuple_, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.future import select
 
+def _timestamp_bound(db: AsyncSession, value: datetime):
+    if db.get_bind().dialect.name != "sqlite":
+        return literal(value, Task.created_at.type)
+    # Task timestamps are filled by CURRENT_TIMESTAMP, which SQLite stores as
+    # text without fractional seconds. Bind in that same textual form so ties
+    # compare equal (and a cursor falls through to the id tiebreaker).
+    text_value = value.strftime("%Y-%m-%d %H:%M:%S")
+    if value.microsecond:
+        text_value += value.strftime(".%f")
+    return literal(text_value, String)
+
+def _task_not_found():
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Task not found"
+    )
+
+TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.user_id,
+    Task.created_at,
+    Task.updated_at,
+)
+
+# Soft-deleted rows stay in tasks as tombstones for GET /tasks/changes and
+# are invisible everywhere else.
+LIVE_TASK = Task.deleted_at.is_(None)
+
+ARCHIVED_TASK_COLUMNS = (
+    ArchivedTask.id,
+    ArchivedTask.title,
+    ArchivedTask.description,
+    ArchivedTask.status,
+    ArchivedTask.user_id,
+    ArchivedTask.created_at,
+    ArchivedTask.updated_at,
+)
+
+def _projection(model, fields: tuple[str, ...], required: tuple[str, ...] = ()):
+    # Only the requested columns are read; required ones (e.g. for the
+    # cursor) are added after them.
+    names = fields + tuple(name for name in required if name not in fields)
+    return tuple(getattr(model, name) for name in names)
+
+def _user_tasks_query(
+    db: AsyncSession,
+    model,
+    columns,
+    user_id: int,
+    limit: int,
+    after: tuple[datetime, int] | None,
+    task_status: TaskStatus | None
+):
+    stmt = (
+        select(*columns)
+        .where(model.user_id == user_id)
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit + 1)
+    )
+    if model is Task:
+        stmt = stmt.where(LIVE_TASK)
+    if task_status is not None:
+        stmt = stmt.where(model.status == task_status.value)
+    if after is not None:
+        created_at, task_id = after
+        stmt = stmt.where(
+            tuple_(model.created_at, model.id)
+            < tuple_(_timestamp_bound(db, created_at), literal(task_id))
+        )
+    return stmt
+
+def _fts_query(q: str) -> str:
+    # Quote every word so user input can never be parsed as FTS5 syntax,
+    # and prefix-match each one.
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", q))
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+def _check_batch_size(count: int):
+    if count > settings.TASKS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch size exceeds {settings.TASKS_BULK_MAX_ITEMS} items"
+        )
+
 class Taskservice:
 
     @staticmethod
     async def create_task(db: AsyncSession, user_id: int, data: TaskCreate):
-        task = Task(
-            title=data.title,
-            description=data.description,
-            user_id=user_id
+        stmt = (
+            insert(Task)
+            .values(
+                title=data.title,
+                description=data.description,
+                user_id=user_id
+            )
+            .returning(Task)
         )
-        db.add(task)
+        result = await db.execute(stmt)
+        task = result.scalars().one()
         await db.commit()
-        await db.refresh(task)
+        task_events.publish_tasks(user_id, "created", [task])
         return task
     
     @staticmethod
-    async def get_user_tasks(db: AsyncSession, user_id: int):
+    async def get_user_tasks(
+        db: AsyncSession,
+        user_id: int,
+        limit: int,
+        cursor: str | None = None,
+        task_status: TaskStatus | None = None,
+        as_rows: bool = False,
+        include_archived: bool = False,
+        fields: tuple[str, ...] | None = None
+    ):
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+
+        task_columns, archived_columns = TASK_COLUMNS, ARCHIVED_TASK_COLUMNS
+        if fields is not None:
+            task_columns = _projection(Task, fields, ("created_at", "id"))
+            archived_columns = _projection(ArchivedTask, fields, ("created_at", "id"))
+            as_rows = True
+
+        if include_archived:
+            # Take the next page from each table on its own index, then merge.
+            # Archived tasks have no ORM identity here, so both come back as rows.
+            live = _user_tasks_query(db, Task, task_columns, user_id, limit, after, task_status)
+            archived = _user_tasks_query(
+                db, ArchivedTask, archived_columns, user_id, limit, after, task_status
+            )
+            merged = union_all(select(live.subquery()), select(archived.subquery())).subquery()
+            stmt = (
+                select(merged)
+                .order_by(merged.c.created_at.desc(), merged.c.id.desc())
+                .limit(limit + 1)
+            )
+            as_rows = True
+        else:
+            stmt = _user_tasks_query(
+                db, Task, task_columns if as_rows else (Task,), user_id, limit, after, task_status
+            )
+
+        result = await db.execute(stmt)
+        tasks = result.all() if as_rows else result.scalars().all()
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            last = tasks[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return tasks, next_cursor
+
+    @staticmethod
+    async def stream_user_tasks(db: AsyncSession, user_id: int, chunk_size: int):
+        # Server-side cursor, chunk_size rows at a time, in the list order so
+        # SQLite walks the index instead of sorting. Archived tasks follow.
+        for model, columns in ((Task, TASK_COLUMNS), (ArchivedTask, ARCHIVED_TASK_COLUMNS)):
+            stmt = (
+                select(*columns)
+                .where(model.user_id == user_id)
+                .order_by(model.created_at.desc(), model.id.desc())
+                .execution_options(yield_per=chunk_size)
+            )
+            if model is Task:
+                stmt = stmt.where(LIVE_TASK)
+            result = await db.stream(stmt)
+            async for rows in result.partitions():
+                yield rows
+
+    @staticmethod
+    async def get_tasks_version(db: AsyncSession, user_id: int):
+        stmt = select(TaskVersion.version).where(TaskVersion.user_id == user_id)
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none() or 0
+
+    @staticmethod
+    async def get_task_stats(db: AsyncSession, user_id: int):
+        stmt = select(TaskStatusCount.status, TaskStatusCount.count).where(
+            TaskStatusCount.user_id == user_id
+        )
+        result = await db.execute(stmt)
+        stats = {task_status.value: 0 for task_status in TaskStatus}
+        for task_status, count in result.all():
+            stats[task_status] = count
+        stats["total"] = sum(stats.values())
+        return stats
+
+    @staticmethod
+    async def search_tasks(db: AsyncSession, user_id: int, q: str, limit: int, offset: int = 0):
+        match = _fts_query(q)
+        if not match:
+            return []
+
         stmt = (
             select(Task)
-            .where(Task.user_id == user_id)
-            .order_by(Task.created_at.desc())
+            .join(tasks_fts, tasks_fts.c.rowid == Task.id)
+            .where(text("tasks_fts MATCH :match").bindparams(match=match))
+            .where(Task.user_id == user_id, LIVE_TASK)
+            .order_by(text("bm25(tasks_fts)"), Task.id.desc())
+            .limit(limit)
+            .offset(offset)
         )
         result = await db.execute(stmt)
         return result.scalars().all()
 
     @staticmethod
-    async def get_task(db: AsyncSession, task_id: int, user_id: int):
-        stmt = select(Task).where(Task.id == task_id,
-            Task.user_id == user_id)
+    async def get_task(
+        db: AsyncSession,
+        task_id: int,
+        user_id: int,
+        fields: tuple[str, ...] | None = None
+    ):
+        columns = (Task,) if fields is None else _projection(Task, fields)
+        stmt = select(*columns).where(Task.id == task_id,
+            Task.user_id == user_id, LIVE_TASK)
         result = await db.execute(stmt)
-        task = result.scalars().first()
+        task = result.scalars().first() if fields is None else result.first()
         if not task:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Task not found"
-            )
+            raise _task_not_found()
         return task
 
     @staticmethod
-    async def update_task(db: AsyncSession, task: Task, data: TaskUpdate):
-        if data.title is not None:
-            task.title = data.title
-        if data.description is not None:
-            task.description = data.description
-        if data.status is not None:
-            task.status = data.status
+    async def update_task(db: AsyncSession, task_id: int, user_id: int, data: TaskUpdate):
+        values = data.model_dump(exclude_none=True)
+        if not values:
+            return await Taskservice.get_task(db, task_id, user_id)
 
+        stmt = (
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == user_id, LIVE_TASK)
+            .values(**values)
+            .returning(Task)
+        )
+        result = await db.execute(stmt)
+        task = result.scalars().first()
+        if not task:
+            await db.rollback()
+            raise _task_not_found()
         await db.commit()
-        await db.refresh(task)
+        task_events.publish_tasks(user_id, "updated", [task])
         return task
     
     @staticmethod
-    async def delete_task(db: AsyncSession, task: Task):
-        await db.delete(task)
+    async def delete_task(db: AsyncSession, task_id: int, user_id: int):
+        stmt = (
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == user_id, LIVE_TASK)
+            .values(deleted_at=func.now())
+            .returning(Task.id)
+        )
+        result = await db.execute(stmt)
+        if result.scalar_one_or_none() is None:
+            await db.rollback()
+            raise _task_not_found()
         await db.commit()
+        task_events.publish_deleted(user_id, [task_id])
         return True
+
+    @staticmethod
+    async def archive_completed_tasks(db: AsyncSession, older_than: datetime, batch_size: int):
+        # The literal status matches the partial index's WHERE clause, which
+        # a bound parameter would not.
+        completed = Task.status == literal_column(f"'{TaskStatus.completed.value}'")
+        # Never move the newest row: tasks.id has no AUTOINCREMENT, so SQLite
+        # would hand that id out again and clash with the archived copy.
+        newest_id = select(func.max(Task.id)).scalar_subquery()
+        ids = await db.scalars(
+            select(Task.id)
+            .where(
+                completed,
+                LIVE_TASK,
+                Task.created_at < _timestamp_bound(db, older_than),
+                Task.id < newest_id
+            )
+            .order_by(Task.created_at)
+            .limit(batch_size)
+        )
+        ids = ids.all()
+        if not ids:
+            return 0
+
+        # Re-check the status in the write transaction in case a task was
+        # reopened since the select.
+        moving = select(*TASK_COLUMNS).where(Task.id.in_(ids), completed, LIVE_TASK)
+        await db.execute(
+            insert(ArchivedTask).from_select([column.key for column in TASK_COLUMNS], moving)
+        )
+        result = await db.execute(delete(Task).where(Task.id.in_(ids), completed, LIVE_TASK))
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def get_task_changes(db: AsyncSession, user_id: int, limit: int, since: str | None = None):
+        after = (0, 0)
+        full_sync = since is None
+        if since is not None:
+            try:
+                *after, full_sync = decode_change_cursor(since)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            after = tuple(after)
+        compacted_seq = await db.scalar(
+            select(TaskSyncCompaction.compacted_seq).where(TaskSyncCompaction.user_id == user_id)
+        ) or 0
+        # Only the incremental feed relies on tombstones; a full sync replaces
+        # the client's copy, so its pages never expire.
+        if not full_sync and after[0] < compacted_seq:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Cursor expired, sync again from the start"
+            )
+
+        stmt = (
+            select(Task)
+            .where(Task.user_id == user_id)
+            .where(tuple_(Task.change_seq, Task.id) > tuple_(literal(after[0]), literal(after[1])))
+            .order_by(Task.change_seq, Task.id)
+            .limit(limit + 1)
+        )
+        # A first sync has nothing to delete yet.
+        if since is None:
+            stmt = stmt.where(LIVE_TASK)
+        tasks = (await db.scalars(stmt)).all()
+
+        has_more = len(tasks) > limit
+        tasks = tasks[:limit]
+        position = (tasks[-1].change_seq, tasks[-1].id) if tasks else after
+        if full_sync and not has_more:
+            # The last page of a full sync hands over to the incremental feed.
+            # The client holds every live row, and the compacted tombstones
+            # are of tasks it never saw, so start past them.
+            position = max(position, (compacted_seq, 0))
+            full_sync = False
+        cursor = encode_change_cursor(*position, full_sync=full_sync)
+        changes = [
+            {"id": task.id, "deleted": True}
+            if task.deleted_at is not None
+            else {"id": task.id, "deleted": False, "task": task}
+            for task in tasks
+        ]
+        return {"changes": changes, "cursor": cursor, "has_more": has_more}
+
+    @staticmethod
+    async def compact_tombstones(db: AsyncSession, older_than: datetime, batch_size: int):
+        # Same guard as archiving: keep the newest id so SQLite doesn't reuse it.
+        newest_id = select(func.max(Task.id)).scalar_subquery()
+        rows = await db.execute(
+            select(Task.id, Task.user_id, Task.change_seq)
+            .where(
+                Task.deleted_at.is_not(None),
+                Task.deleted_at < _timestamp_bound(db, older_than),
+                Task.id < newest_id
+            )
+            .order_by(Task.deleted_at)
+            .limit(batch_size)
+        )
+        rows = rows.all()
+        if not rows:
+            return 0
+
+        await db.execute(delete(Task).where(Task.id.in_([row.id for row in rows])))
+        # Cursors from before these tombstones can no longer see the deletes,
+        # but only their owners' cursors are affected.
+        compacted = {}
+        for row in rows:
+            compacted[row.user_id] = max(compacted.get(row.user_id, 0), row.change_seq)
+        stmt = sqlite_insert(TaskSyncCompaction).values([
+            {"user_id": user_id, "compacted_seq": seq} for user_id, seq in compacted.items()
+        ])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[TaskSyncCompaction.user_id],
+            set_={"compacted_seq": func.max(
+                TaskSyncCompaction.compacted_seq, stmt.excluded.compacted_seq
+            )}
+        ))
+        await db.commit()
+        return len(rows)
+
+    @staticmethod
+    async def count_user_tasks(
+        db: AsyncSession,
+        user_id: int,
+        task_status: TaskStatus | None = None,
+        exclude_status: TaskStatus | None = None
+    ):
+        stmt = select(func.count()).select_from(Task).where(Task.user_id == user_id, LIVE_TASK)
+        if task_status is not None:
+            stmt = stmt.where(Task.status == task_status.value)
+        if exclude_status is not None:
+            stmt = stmt.where(Task.status != exclude_status.value)
+        return await db.scalar(stmt)
+
+    @staticmethod
+    async def delete_tasks_batch(
+        db: AsyncSession,
+        user_id: int,
+        task_status: TaskStatus | None,
+        batch_size: int
+    ):
+        # One short transaction per call; callers loop until it returns
+        # fewer than batch_size.
+        batch = (
+            select(Task.id)
+            .where(Task.user_id == user_id, LIVE_TASK)
+            .order_by(Task.id)
+            .limit(batch_size)
+        )
+        if task_status is not None:
+            batch = batch.where(Task.status == task_status.value)
+        result = await db.scalars(
+            update(Task)
+            .where(Task.id.in_(batch))
+            .values(deleted_at=func.now())
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        ids = result.all()
+        await db.commit()
+        task_events.publish_deleted(user_id, ids)
+        return len(ids)
+
+    @staticmethod
+    async def update_status_batch(
+        db: AsyncSession,
+        user_id: int,
+        task_status: TaskStatus | None,
+        new_status: TaskStatus,
+        batch_size: int
+    ):
+        # Rows already at new_status drop out of the filter, so repeated
+        # calls make progress.
+        batch = (
+            select(Task.id)
+            .where(Task.user_id == user_id, LIVE_TASK, Task.status != new_status.value)
+            .order_by(Task.id)
+            .limit(batch_size)
+        )
+        if task_status is not None:
+            batch = batch.where(Task.status == task_status.value)
+        result = await db.scalars(
+            update(Task)
+            .where(Task.id.in_(batch))
+            .values(status=new_status.value)
+            .returning(Task)
+            .execution_options(synchronize_session=False)
+        )
+        tasks = result.all()
+        await db.commit()
+        task_events.publish_tasks(user_id, "updated", tasks)
+        return len(tasks)
+
+    @staticmethod
+    async def bulk_create_tasks(db: AsyncSession, user_id: int, items: list[TaskCreate]):
+        _check_batch_size(len(items))
+        if not items:
+            return []
+
+        stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+        params = [
+            {"title": item.title, "description": item.description, "user_id": user_id}
+            for item in items
+        ]
+        result = await db.scalars(stmt, params)
+        tasks = result.all()
+        await db.commit()
+        task_events.publish_tasks(user_id, "created", tasks)
+        return [{"id": task.id, "status": "created", "task": task} for task in tasks]
+
+    @staticmethod
+    async def import_tasks(db: AsyncSession, user_id: int, records, batch_size: int, max_errors: int):
+        summary = {"imported": 0, "failed": 0, "errors": []}
+        batch = []
+
+        def fail(line: int, message: str):
+            summary["failed"] += 1
+            if len(summary["errors"]) < max_errors:
+                summary["errors"].append({"line": line, "error": message})
+
+        async def flush():
+            params = [
+                {
+                    "title": item.title,
+                    "description": item.description,
+                    "status": item.status.value,
+                    "user_id": user_id,
+                }
+                for _, item in batch
+            ]
+            try:
+                await db.execute(insert(Task), params)
+                await db.commit()
+                summary["imported"] += len(batch)
+            except SQLAlchemyError:
+                await db.rollback()
+                # Retry one by one so a bad row only fails itself.
+                for (line, _), row in zip(batch, params):
+                    try:
+                        await db.execute(insert(Task), [row])
+                        await db.commit()
+                        summary["imported"] += 1
+                    except SQLAlchemyError as exc:
+                        await db.rollback()
+                        fail(line, f"Database error: {exc.orig or exc}")
+            batch.clear()
+
+        async for line, record in records:
+            if isinstance(record, str):
+                fail(line, record)
+                continue
+            try:
+                item = TaskCreate.model_validate(record)
+            except ValidationError as exc:
+                fail(line, _validation_message(exc))
+                continue
+            batch.append((line, item))
+            if len(batch) >= batch_size:
+                await flush()
+        if batch:
+            await flush()
+        if summary["imported"]:
+            task_events.publish_resync(user_id)
+        return summary
+
+    @staticmethod
+    async def bulk_update_tasks(db: AsyncSession, user_id: int, items: list[TaskBulkUpdateItem]):
+        _check_batch_size(len(items))
+        if not items:
+            return []
+
+        ids = {item.id for item in items}
+        owned = await db.scalars(
+            select(Task.id).where(Task.user_id == user_id, Task.id.in_(ids), LIVE_TASK)
+        )
+        owned_ids = set(owned.all())
+
+        # One executemany UPDATE for the whole batch. Fields left out of an
+        # item are bound as NULL and keep their current value via COALESCE.
+        params = [
+            {
+                "b_id": item.id,
+                "b_title": item.title,
+                "b_description": item.description,
+                "b_status": item.status.value if item.status is not None else None,
+            }
+            for item in items
+            if item.id in owned_ids
+        ]
+        if params:
+            stmt = (
+                update(Task.__table__)
+                .where(Task.id == bindparam("b_id"), Task.user_id == user_id, LIVE_TASK)
+                .values(
+                    title=func.coalesce(bindparam("b_title"), Task.title),
+                    description=func.coalesce(bindparam("b_description"), Task.description),
+                    status=func.coalesce(bindparam("b_status"), Task.status),
+                )
+            )
+            await db.execute(stmt, params)
+
+        rows = await db.scalars(
+            select(Task)
+            .where(Task.id.in_(owned_ids))
+            .execution_options(populate_existing=True)
+        )
+        tasks = {task.id: task for task in rows.all()}
+        await db.commit()
+        task_events.publish_tasks(user_id, "updated", tasks.values())
+
+        return [
+            {"id": item.id, "status": "updated", "task": tasks[item.id]}
+            if item.id in tasks
+            else {"id": item.id, "status": "not_found"}
+            for item in items
+        ]
+
+    @staticmethod
+    async def bulk_delete_tasks(db: AsyncSession, user_id: int, ids: list[int]):
+        _check_batch_size(len(ids))
+        if not ids:
+            return []
+
+        result = await db.scalars(
+            update(Task)
+            .where(Task.user_id == user_id, Task.id.in_(set(ids)), LIVE_TASK)
+            .values(deleted_at=func.now())
+            .returning(Task.id)
+        )
+        deleted = set(result.all())
+        await db.commit()
+        task_events.publish_deleted(user_id, deleted)
+
+        return [
+            {"id": task_id, "status": "deleted" if task_id in deleted else "not_found"}
+            for task_id in ids
+        ]
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.core.database import async_session_local, shard_session_locals
+from app.services.task_service import Taskservice
+
+logger = logging.getLogger(__name__)
+
+class TombstoneCompactor:
+    """Hard-deletes tombstones older than TASKS_TOMBSTONE_RETENTION_DAYS.
+
+    Clients whose GET /tasks/changes cursor predates a compacted tombstone get
+    410 and sync again from the start. Runs in chunks of
+    TASKS_TOMBSTONE_BATCH_SIZE, one short transaction each, like TaskArchiver.
+    """
+
+    @staticmethod
+    async def compact_once() -> int:
+        older_than = datetime.now(timezone.utc) - timedelta(days=settings.TASKS_TOMBSTONE_RETENTION_DAYS)
+        total = 0
+        for session_factory in shard_session_locals or [async_session_local]:
+            while True:
+                async with session_factory() as db:
+                    removed = await Taskservice.compact_tombstones(
+                        db, older_than, settings.TASKS_TOMBSTONE_BATCH_SIZE
+                    )
+                total += removed
+                if removed < settings.TASKS_TOMBSTONE_BATCH_SIZE:
+                    break
+                await asyncio.sleep(settings.TASKS_ARCHIVE_BATCH_PAUSE_SECONDS)
+        return total
+
+    @staticmethod
+    async def run_forever():
+        while True:
+            try:
+                removed = await TombstoneCompactor.compact_once()
+                if removed:
+                    logger.info("Compacted %d task tombstones", removed)
+            except SQLAlchemyError:
+                logger.exception("Tombstone compaction failed")
+            await asyncio.sleep(settings.TASKS_TOMBSTONE_INTERVAL_SECONDS)
@@ -1,6 +1,13 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status, Depends
 from passlib.context import CryptContext
+from app.core.cache import principal_cache
+from app.core.config import settings
+from app.core.metrics import password_hash_duration
 from app.models.user import User
 from app.schemas.user import UserCreate
 from sqlalchemy.future import select
@@ -10,16 +17,49 @@ pwd_context = CryptContext(
     deprecated="auto"
 )
 
+# Argon2 is CPU bound and argon2-cffi releases the GIL, so hashing runs on a
+# small dedicated thread pool instead of blocking the event loop. Calls beyond
+# workers + queue depth are rejected rather than queued without bound.
+hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_hash_lock = threading.Lock()
+_hash_pending = 0
+
+async def run_in_hash_pool(func, *args):
+    global _hash_pending
+    with _hash_lock:
+        if _hash_pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_DEPTH:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later",
+                headers={"Retry-After": "1"}
+            )
+        _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hash_executor, func, *args)
+    finally:
+        with _hash_lock:
+            _hash_pending -= 1
+
 class UserService:
     @staticmethod
     def hash_password(password: str):
         password = password.encode("utf-8")[:72].decode("utf-8")
-        return pwd_context.hash(password)
+        start = time.perf_counter()
+        hashed = pwd_context.hash(password)
+        password_hash_duration.observe(time.perf_counter() - start, "hash")
+        return hashed
 
     @staticmethod
     def verify_password(plain: str, hashed: str):
         plain = plain.encode("utf-8")[:72].decode("utf-8")
-        return pwd_context.verify(plain, hashed)
+        start = time.perf_counter()
+        verified = pwd_context.verify(plain, hashed)
+        password_hash_duration.observe(time.perf_counter() - start, "verify")
+        return verified
 
     @staticmethod
     async def create_user(db: AsyncSession, data: UserCreate):
@@ -34,12 +74,14 @@ class UserService:
 
         user = User(
             email=data.email,
-            password_hash=UserService.hash_password(data.password),
+            password_hash=await run_in_hash_pool(UserService.hash_password, data.password),
         )
 
         db.add(user)
         await db.commit()
         await db.refresh(user)
+        # SQLite may hand out the id of a deleted user again.
+        principal_cache.invalidate(user.id)
         return user
         
     @staticmethod
@@ -49,6 +91,21 @@ class UserService:
         user = result.scalars().first()
         if not user:
             return None
-        if not UserService.verify_password(password, user.password_hash):
+        if not await run_in_hash_pool(UserService.verify_password, password, user.password_hash):
             return None
         return user
+
+    @staticmethod
+    async def set_active(db: AsyncSession, user_id: int, is_active: bool):
+        stmt = select(User).where(User.id == user_id)
+        result = await db.execute(stmt)
+        user = result.scalars().first()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        user.is_active = is_active
+        await db.commit()
+        principal_cache.invalidate(user.id)
+        return user
@@ -0,0 +1,93 @@
+import logging
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.core.database import engine, read_engine, shard_engines
+from app.core.metrics import app_warmup_duration
+from app.models.user import User
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.task_service import Taskservice
+from app.services.user_service import UserService, pwd_context, run_in_hash_pool
+from app.util.pagination import encode_cursor
+
+logger = logging.getLogger(__name__)
+
+class WarmupService:
+
+    @staticmethod
+    async def run():
+        start = time.perf_counter()
+
+        await WarmupService.open_connections(engine, settings.WARMUP_POOL_CONNECTIONS)
+        if read_engine is not engine:
+            await WarmupService.open_connections(read_engine, settings.WARMUP_POOL_CONNECTIONS)
+        for shard_engine in shard_engines:
+            await WarmupService.open_connections(shard_engine, settings.WARMUP_POOL_CONNECTIONS)
+
+        # The compiled cache is per engine, so warm every engine tasks run on.
+        for async_engine in [engine, *shard_engines]:
+            try:
+                await WarmupService.compile_hot_statements(async_engine)
+            except SQLAlchemyError as exc:
+                # A schema that is not migrated yet should not keep the app
+                # down; the first real request will report the problem.
+                logger.warning("Statement warm-up skipped: %s", exc)
+
+        await WarmupService.init_password_hashing()
+
+        duration = time.perf_counter() - start
+        app_warmup_duration.set(value=duration)
+        logger.info("Warm-up finished in %.3fs", duration)
+
+    @staticmethod
+    async def open_connections(async_engine, count: int):
+        # Hold every connection at once so the pool really grows to count,
+        # and run a trivial query on each so a bad URL fails startup.
+        async with AsyncExitStack() as stack:
+            for _ in range(count):
+                conn = await stack.enter_async_context(async_engine.connect())
+                await conn.execute(text("SELECT 1"))
+
+    @staticmethod
+    async def compile_hot_statements(async_engine):
+        # Run the hot Taskservice / get_current_user statements for real so
+        # they land in the engine's compiled cache, inside an outer
+        # transaction that is rolled back; the session's own commits leave it open.
+        async with async_engine.connect() as conn:
+            transaction = await conn.begin()
+            db = AsyncSession(
+                bind=conn,
+                join_transaction_mode="rollback_only",
+                expire_on_commit=False
+            )
+            try:
+                user_id = -1
+                await db.execute(select(User).where(User.id == user_id))
+                await Taskservice.get_tasks_version(db, user_id)
+                await Taskservice.get_task_stats(db, user_id)
+                await Taskservice.get_user_tasks(db, user_id, settings.TASKS_PAGE_SIZE)
+                await Taskservice.get_user_tasks(
+                    db,
+                    user_id,
+                    settings.TASKS_PAGE_SIZE,
+                    encode_cursor(datetime.now(), 0),
+                    as_rows=settings.TASKS_FAST_JSON
+                )
+                task = await Taskservice.create_task(db, user_id, TaskCreate(title="warm-up"))
+                await Taskservice.get_task(db, task.id, user_id)
+                await Taskservice.update_task(db, task.id, user_id, TaskUpdate(title="warm-up"))
+                await Taskservice.delete_task(db, task.id, user_id)
+            finally:
+                await db.close()
+                await transaction.rollback()
+
+    @staticmethod
+    async def init_password_hashing():
+        # Load the argon2 backend and start one hashing thread.
+        pwd_context.handler("argon2").get_backend()
+        await run_in_hash_pool(UserService.hash_password, "warm-up")
@@ -1,14 +1,23 @@
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import NullPool
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+# Tests swap in their own sessions; keep startup and background jobs off
+# the configured database.
+os.environ.setdefault("WARMUP_ENABLED", "false")
+os.environ.setdefault("TASKS_TOMBSTONE_COMPACTION_ENABLED", "false")
+os.environ.setdefault("TASK_JOBS_ENABLED", "false")
 from app.main import app
 from app.core.database import Base
-from app.dependencies.db import get_db
+from app.dependencies.db import get_db, get_read_db
+from app.dependencies.admission import auth_admission
 from app.models.user import User
 from app.models.task import Task
 from app.core.config import settings
@@ -19,6 +28,20 @@ engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# The app runs on AsyncSession/aiosqlite, so requests get an async session on
+# the same file. NullPool keeps connections from outliving a TestClient's
+# event loop.
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+AsyncTestingSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def run_in_session(method, *args):
+    """Runs a service coroutine on a fresh test session and returns its result."""
+    async def run():
+        async with AsyncTestingSessionLocal() as db:
+            return await method(db, *args)
+
+    return asyncio.run(run())
 
 
 @pytest.fixture(name="db_session")
@@ -33,13 +56,13 @@ def db_session_fixture():
 
 @pytest.fixture(name="client")
 def client_fixture(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            db_session.close()
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as session:
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    auth_admission.reset()
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -13,7 +13,7 @@ def test_register_user(client: TestClient, db_session: Session):
     assert "id" in data
     assert data["email"] == "test@example.com"
     assert "password_hash" not in data
-    assert data["is_active"] == False
+    assert data["is_active"] == True
 
     user = db_session.query(User).filter(User.email == "test@example.com").first()
     assert user is not None
@@ -69,3 +69,32 @@ def test_login_invalid_credentials(client: TestClient, db_session: Session):
     )
     assert response.status_code == 401
     assert response.json()["detail"] == "Invalid email or password"
+
+def test_login_rate_limited_per_email(client: TestClient, db_session: Session):
+    client.post(
+        "/auth/register",
+        json={"email": "limited@example.com", "password": "testpassword"}
+    )
+
+    statuses = [
+        client.post(
+            "/auth/login",
+            json={"email": "limited@example.com", "password": "wrongpassword"}
+        ).status_code
+        # registering used one token of the same email's bucket
+        for _ in range(settings.AUTH_EMAIL_BURST - 1)
+    ]
+    assert 429 not in statuses
+
+    response = client.post(
+        "/auth/login",
+        json={"email": "Limited@example.com", "password": "testpassword"}
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    response = client.post(
+        "/auth/login",
+        json={"email": "someoneelse@example.com", "password": "testpassword"}
+    )
+    assert response.status_code == 401
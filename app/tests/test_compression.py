@@ -0,0 +1,98 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.middleware.compression import choose_encoding
+from app.util.media_type import choose_media_type
+from app.schemas.task import TASKS_COLUMNAR_MEDIA_TYPE
+from app.tests.test_tasks import get_auth_token
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate, br") == "gzip"
+    assert choose_encoding("deflate;q=1, gzip;q=0.5") == "deflate"
+    assert choose_encoding("gzip;q=0, deflate") == "deflate"
+    assert choose_encoding("*;q=0.1") == "gzip"
+    assert choose_encoding("br, identity") is None
+    assert choose_encoding("") is None
+
+def test_choose_media_type():
+    offered = ["application/json", TASKS_COLUMNAR_MEDIA_TYPE]
+    assert choose_media_type(TASKS_COLUMNAR_MEDIA_TYPE, offered) == TASKS_COLUMNAR_MEDIA_TYPE
+    assert choose_media_type(f"{TASKS_COLUMNAR_MEDIA_TYPE};q=0", offered) is None
+    assert choose_media_type(
+        f"application/json, {TASKS_COLUMNAR_MEDIA_TYPE};q=0.5", offered
+    ) == "application/json"
+    assert choose_media_type(f"{TASKS_COLUMNAR_MEDIA_TYPE}, */*;q=0.1", offered) == TASKS_COLUMNAR_MEDIA_TYPE
+    # Equal preference keeps the default.
+    assert choose_media_type(f"{TASKS_COLUMNAR_MEDIA_TYPE}, application/json", offered) == "application/json"
+    assert choose_media_type("*/*", offered) == "application/json"
+    assert choose_media_type("text/html", offered) is None
+
+def _headers_with_tasks(client: TestClient, email: str, count: int):
+    token = get_auth_token(client, email, "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post(
+        "/tasks/bulk",
+        headers=headers,
+        json=[{"title": f"Task {i}", "description": "lorem ipsum " * 10} for i in range(count)]
+    )
+    return headers
+
+def test_large_responses_are_compressed(client: TestClient, db_session: Session):
+    headers = _headers_with_tasks(client, "gzip@example.com", 30)
+
+    plain = client.get("/tasks", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept, Accept-Encoding"
+    assert client.get("/tasks", headers=headers).headers["vary"] == "Accept, Accept-Encoding"
+    for encoding in ("gzip", "deflate"):
+        response = client.get("/tasks", headers={**headers, "Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert int(response.headers["content-length"]) < len(plain.content)
+        assert response.headers["etag"] == "W/" + plain.headers["etag"]
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == plain.json()
+
+    # Weak ETags still revalidate.
+    response = client.get(
+        "/tasks",
+        headers={**headers, "Accept-Encoding": "gzip", "If-None-Match": "W/" + plain.headers["etag"]}
+    )
+    assert response.status_code == 304
+    assert "Accept-Encoding" in response.headers["vary"]
+
+    # Too small to compress, but it would be compressed if it grew.
+    response = client.get("/tasks/stats", headers={**headers, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    response = client.get("/tasks/export", headers={**headers, "Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.text.splitlines()) == 30
+
+def test_columnar_task_list(client: TestClient, db_session: Session):
+    headers = _headers_with_tasks(client, "columnar@example.com", 3)
+
+    rows = client.get("/tasks", headers=headers).json()
+    response = client.get("/tasks", headers={**headers, "Accept": TASKS_COLUMNAR_MEDIA_TYPE})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == TASKS_COLUMNAR_MEDIA_TYPE
+    columns = response.json()
+    assert list(columns) == list(rows[0])
+    assert [dict(zip(columns, values)) for values in zip(*columns.values())] == rows
+
+    for accept in (
+        f"{TASKS_COLUMNAR_MEDIA_TYPE};q=0, application/json",
+        f"application/json, {TASKS_COLUMNAR_MEDIA_TYPE};q=0.9",
+    ):
+        response = client.get("/tasks", headers={**headers, "Accept": accept})
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == rows
+
+    response = client.get(
+        "/tasks",
+        headers={**headers, "Accept": TASKS_COLUMNAR_MEDIA_TYPE},
+        params={"fields": "id,title"}
+    )
+    assert response.json() == {
+        "id": [row["id"] for row in rows],
+        "title": [row["title"] for row in rows],
+    }
@@ -0,0 +1,54 @@
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.events import RESYNC_FRAME, TaskEventBroker, task_events
+from app.tests.test_tasks import get_auth_token
+
+def _parse(frame: str):
+    fields = dict(line.split(": ", 1) for line in frame.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+def test_stream_delivers_events_and_drops_slow_consumer():
+    broker = TaskEventBroker(max_queue=2, max_per_user=1)
+
+    async def run():
+        stream = broker.stream(7, keepalive_seconds=0.01)
+        assert await anext(stream) == ": keep-alive\n\n"
+        assert not broker.has_capacity(7)
+
+        broker.publish(7, "deleted", {"id": 1})
+        broker.publish(8, "deleted", {"id": 2})
+        assert _parse(await anext(stream)) == ("deleted", {"id": 1})
+
+        for task_id in range(3):
+            broker.publish(7, "deleted", {"id": task_id})
+        assert broker.has_capacity(7)
+        assert await anext(stream) == RESYNC_FRAME
+        frames = [frame async for frame in stream]
+        return frames
+
+    assert asyncio.run(run()) == []
+
+def test_task_writes_publish_events(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "events@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    task = client.post("/tasks", headers=headers, json={"title": "Watched"}).json()
+
+    subscription = task_events.subscribe(task["user_id"])
+    try:
+        client.put(f"/tasks/{task['id']}", headers=headers, json={"status": "completed"})
+        client.delete(f"/tasks/{task['id']}", headers=headers)
+
+        event, data = _parse(subscription.queue.get_nowait())
+        assert (event, data["id"], data["status"]) == ("updated", task["id"], "completed")
+        assert _parse(subscription.queue.get_nowait()) == ("deleted", {"id": task["id"]})
+        assert subscription.queue.empty()
+    finally:
+        task_events.unsubscribe(subscription)
+
+def test_event_stream_limit(client: TestClient, db_session: Session, monkeypatch):
+    token = get_auth_token(client, "eventlimit@example.com", "testpassword")
+    monkeypatch.setattr(task_events, "max_per_user", 0)
+    response = client.get("/tasks/events", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 429
@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+def test_metrics_endpoint(client: TestClient, db_session: Session):
+    client.post("/auth/register", json={"email": "metrics@example.com", "password": "testpassword"})
+    token = client.post(
+        "/auth/login",
+        json={"email": "metrics@example.com", "password": "testpassword"}
+    ).json()["access_token"]
+    client.get("/tasks/12345", headers={"Authorization": f"Bearer {token}"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/tasks/{task_id}",status="404"}' in body
+    assert 'http_request_duration_seconds_bucket{method="POST",route="/auth/login",status="200",le="+Inf"}' in body
+    assert "http_requests_in_flight" in body
+    assert 'password_hash_duration_seconds_count{operation="hash"}' in body
+    assert 'password_hash_duration_seconds_count{operation="verify"}' in body
+    assert "# TYPE db_pool_connections gauge" in body
@@ -0,0 +1,38 @@
+import logging
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.middleware.query_profiler import (
+    QueryProfilerMiddleware,
+    install_query_profiler,
+    normalize_statement,
+)
+
+def test_normalize_statement():
+    assert normalize_statement(
+        "SELECT * FROM tasks\n WHERE id IN (?, ?, ?) AND title = 'x' LIMIT 10"
+    ) == "SELECT * FROM tasks WHERE id IN (?) AND title = ? LIMIT ?"
+
+def test_query_profiler_headers_and_repeat_warning(caplog):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    install_query_profiler(engine)
+
+    api = FastAPI()
+    api.add_middleware(QueryProfilerMiddleware, repeat_threshold=2)
+
+    @api.get("/")
+    async def root():
+        async with engine.connect() as conn:
+            for i in range(3):
+                await conn.execute(text("SELECT :value"), {"value": i})
+        return {}
+
+    with caplog.at_level(logging.WARNING, logger="app.middleware.query_profiler"):
+        with TestClient(api) as client:
+            response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.headers["X-DB-Query-Count"] == "3"
+    assert float(response.headers["X-DB-Time-Ms"]) >= 0
+    assert "ran 3 times: SELECT ?" in caplog.text
@@ -0,0 +1,98 @@
+import sqlite3
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from app.core import database
+from app.core.cache import principal_cache
+from app.dependencies import db as db_dependencies
+from app.dependencies.db import get_read_db, pin_primary
+from app.main import app
+from app.models.task import Task
+from app.tests.conftest import AsyncTestingSessionLocal
+from app.tests.test_tasks import get_auth_token
+
+def _snapshot_replica(path):
+    # A lagging replica: a copy of test.db as it is right now.
+    source, target = sqlite3.connect("test.db"), sqlite3.connect(path)
+    source.backup(target)
+    source.close()
+    target.close()
+
+def test_reads_go_to_replica_unless_pinned(client: TestClient, db_session: Session, monkeypatch, tmp_path):
+    token = get_auth_token(client, "replica@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/tasks", headers=headers, json={"title": "Replicated"})
+    replica = tmp_path / "replica.db"
+    _snapshot_replica(replica)
+    client.post("/tasks", headers=headers, json={"title": "Only on primary"})
+
+    replica_engine = create_async_engine(
+        f"sqlite+aiosqlite:///file:{replica}?mode=ro&uri=true", poolclass=NullPool
+    )
+    monkeypatch.setattr(db_dependencies, "async_session_local", AsyncTestingSessionLocal)
+    monkeypatch.setattr(
+        db_dependencies,
+        "async_read_session_local",
+        sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    )
+    # Route through the real get_read_db instead of the primary override.
+    app.dependency_overrides.pop(get_read_db)
+
+    titles = [task["title"] for task in client.get("/tasks", headers=headers).json()]
+    assert titles == ["Replicated"]
+    response = client.get("/tasks", headers={**headers, "X-Read-Primary": "true"})
+    assert [task["title"] for task in response.json()] == ["Only on primary", "Replicated"]
+
+    pinned = APIRouter()
+
+    @pinned.get("/count", dependencies=[Depends(pin_primary)])
+    async def count(db: AsyncSession = Depends(get_read_db)):
+        return await db.scalar(select(func.count()).select_from(Task))
+
+    @pinned.get("/write")
+    async def write(db: AsyncSession = Depends(get_read_db)):
+        await db.execute(text("DELETE FROM tasks"))
+
+    probe = FastAPI()
+    probe.include_router(pinned)
+    with TestClient(probe, raise_server_exceptions=False) as probe_client:
+        assert probe_client.get("/count").json() == 2
+        # The replica URI is read-only.
+        assert probe_client.get("/write").status_code == 500
+
+def test_auth_does_not_depend_on_replica_lag(client: TestClient, db_session: Session, monkeypatch, tmp_path):
+    changed = {"Authorization": f"Bearer {get_auth_token(client, 'lagged@example.com', 'testpassword')}"}
+    replica = tmp_path / "replica.db"
+    _snapshot_replica(replica)
+    # Changed on the primary after the snapshot: deactivated, and a new user.
+    db_session.execute(text("UPDATE users SET is_active = 0 WHERE email = 'lagged@example.com'"))
+    db_session.commit()
+    fresh = {"Authorization": f"Bearer {get_auth_token(client, 'fresh@example.com', 'testpassword')}"}
+
+    replica_engine = create_async_engine(
+        f"sqlite+aiosqlite:///file:{replica}?mode=ro&uri=true", poolclass=NullPool
+    )
+    monkeypatch.setattr(database, "async_session_local", AsyncTestingSessionLocal)
+    monkeypatch.setattr(db_dependencies, "async_session_local", AsyncTestingSessionLocal)
+    monkeypatch.setattr(
+        db_dependencies,
+        "async_read_session_local",
+        sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    )
+    app.dependency_overrides.pop(get_read_db)
+
+    # A user missing from the replica is found on the primary.
+    principal_cache.clear()
+    assert client.get("/users/me", headers=fresh).status_code == 200
+    assert client.post("/tasks", headers=fresh, json={"title": "Fresh"}).status_code == 200
+
+    # A write authenticates against the primary, so it sees the deactivation
+    # that a read on the replica does not.
+    principal_cache.clear()
+    response = client.post("/tasks", headers=changed, json={"title": "Stale"})
+    assert response.status_code == 401
+    principal_cache.clear()
+    assert client.get("/users/me", headers=changed).status_code == 200
@@ -0,0 +1,43 @@
+import os
+import sqlite3
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from app.core import database
+from app.core.database import Base
+from app.tests.test_tasks import get_auth_token
+
+SHARD_FILES = ["./test_shard0.db", "./test_shard1.db"]
+
+def test_tasks_are_stored_on_the_users_shard(client: TestClient, db_session: Session, monkeypatch):
+    shard_engines = []
+    for path in SHARD_FILES:
+        sync_engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(sync_engine)
+        sync_engine.dispose()
+        shard_engines.append(create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool))
+    monkeypatch.setattr(database, "shard_engines", shard_engines)
+    monkeypatch.setattr(database, "shard_session_locals", [
+        sessionmaker(shard_engine, class_=AsyncSession, expire_on_commit=False)
+        for shard_engine in shard_engines
+    ])
+
+    try:
+        titles = {}
+        for email in ("shard-a@example.com", "shard-b@example.com"):
+            headers = {"Authorization": f"Bearer {get_auth_token(client, email, 'testpassword')}"}
+            task = client.post("/tasks/", headers=headers, json={"title": email}).json()
+            titles[task["user_id"]] = task["title"]
+            assert client.get(f"/tasks/{task['id']}", headers=headers).json()["title"] == email
+            assert [t["title"] for t in client.get("/tasks/", headers=headers).json()] == [email]
+
+        for user_id, title in titles.items():
+            shard = sqlite3.connect(SHARD_FILES[database.shard_for(user_id)])
+            assert shard.execute("SELECT user_id, title FROM tasks").fetchall() == [(user_id, title)]
+            shard.close()
+        assert {database.shard_for(user_id) for user_id in titles} == {0, 1}
+    finally:
+        for path in SHARD_FILES:
+            os.remove(path)
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from sqlalchemy.exc import StatementError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.schemas.task import TaskCreate
+from app.services.task_batcher import TaskCreateBatcher
+from app.tests.conftest import AsyncTestingSessionLocal
+from app.tests.test_tasks import get_auth_token
+
+async def _create(batcher: TaskCreateBatcher, user_id: int, data: TaskCreate):
+    async with AsyncTestingSessionLocal() as session:
+        return await batcher.create(session, user_id, data)
+
+def test_batcher_gives_each_caller_its_row(db_session: Session):
+    batcher = TaskCreateBatcher(window_seconds=1, max_batch=3)
+
+    async def run():
+        return await asyncio.gather(*(
+            _create(batcher, user_id, TaskCreate(title=f"Task {user_id}"))
+            for user_id in (1, 2, 3)
+        ))
+
+    tasks = asyncio.run(run())
+    assert [(task.user_id, task.title) for task in tasks] == [
+        (1, "Task 1"), (2, "Task 2"), (3, "Task 3")
+    ]
+    assert len({task.id for task in tasks}) == 3
+
+def test_batcher_isolates_failing_create(db_session: Session):
+    batcher = TaskCreateBatcher(window_seconds=1, max_batch=3)
+    # Skips validation, so the driver rejects the title when binding it.
+    bad = TaskCreate.model_construct(title=["not", "a", "string"], description=None)
+
+    async def run():
+        return await asyncio.gather(
+            _create(batcher, 1, TaskCreate(title="First")),
+            _create(batcher, 1, bad),
+            _create(batcher, 1, TaskCreate(title="Third")),
+            return_exceptions=True
+        )
+
+    first, failed, third = asyncio.run(run())
+    assert isinstance(failed, StatementError)
+    assert (first.title, third.title) == ("First", "Third")
+
+def test_batcher_survives_cancelled_follower(db_session: Session):
+    batcher = TaskCreateBatcher(window_seconds=0.2, max_batch=10)
+
+    async def run():
+        leader = asyncio.create_task(_create(batcher, 1, TaskCreate(title="Leader")))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(_create(batcher, 2, TaskCreate(title="Gone")))
+        last = asyncio.create_task(_create(batcher, 3, TaskCreate(title="Last")))
+        await asyncio.sleep(0.05)
+        # The client disconnects while the leader is still collecting.
+        follower.cancel()
+        results = await asyncio.gather(leader, follower, last, return_exceptions=True)
+        return results
+
+    leader, follower, last = asyncio.run(run())
+    assert isinstance(follower, asyncio.CancelledError)
+    assert (leader.title, last.title) == ("Leader", "Last")
+
+def test_create_task_with_group_commit(client, monkeypatch):
+    monkeypatch.setattr(settings, "TASKS_GROUP_COMMIT_ENABLED", True)
+    token = get_auth_token(client, "batch@example.com", "testpassword")
+    response = client.post(
+        "/tasks/",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"title": "Batched"}
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Batched"
@@ -0,0 +1,189 @@
+import asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.task_job import TaskJob
+from app.services.task_jobs import TaskJobRunner, TaskJobService
+from app.services.task_service import Taskservice
+from app.tests.conftest import AsyncTestingSessionLocal
+from app.tests.test_tasks import get_auth_token
+
+def _runner():
+    return TaskJobRunner([AsyncTestingSessionLocal], workers=2, poll_seconds=0.01)
+
+def test_jobs_run_in_batches(client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_JOBS_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "TASK_JOBS_BATCH_PAUSE_SECONDS", 0)
+    token = get_auth_token(client, "jobs@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    created = client.post(
+        "/tasks/bulk", headers=headers, json=[{"title": f"Job {i}"} for i in range(8)]
+    ).json()
+    client.patch(
+        "/tasks/bulk",
+        headers=headers,
+        json=[{"id": item["id"], "status": "completed"} for item in created[:5]]
+    )
+
+    response = client.post("/tasks/jobs", headers=headers, json={"kind": "delete_tasks", "status": "completed"})
+    assert response.status_code == 202
+    job = response.json()
+    assert (job["status"], job["params"]) == ("queued", {"status": "completed", "new_status": None})
+
+    assert asyncio.run(_runner().run_pending()) == 1
+    job = client.get(f"/tasks/jobs/{job['id']}", headers=headers).json()
+    assert (job["status"], job["total"], job["processed"]) == ("succeeded", 5, 5)
+    assert job["finished_at"] is not None
+    assert [task["title"] for task in client.get("/tasks", headers=headers).json()] == [
+        "Job 7", "Job 6", "Job 5"
+    ]
+
+    job = client.post(
+        "/tasks/jobs", headers=headers, json={"kind": "update_status", "new_status": "completed"}
+    ).json()
+
+    async def run_in_pool():
+        runner = _runner()
+        await runner.start()
+        runner.wake()
+        try:
+            # Wait for the job's own final status, which is written after
+            # its last batch, not just for the tasks to change.
+            for _ in range(200):
+                async with AsyncTestingSessionLocal() as db:
+                    if await db.scalar(select(TaskJob.status).where(TaskJob.id == job["id"])) in (
+                        "succeeded", "failed"
+                    ):
+                        return
+                await asyncio.sleep(0.01)
+        finally:
+            await runner.stop()
+
+    asyncio.run(run_in_pool())
+    job = client.get(f"/tasks/jobs/{job['id']}", headers=headers).json()
+    assert (job["status"], job["total"], job["processed"]) == ("succeeded", 3, 3)
+    assert {task["status"] for task in client.get("/tasks", headers=headers).json()} == {"completed"}
+
+def test_start_requeues_only_stale_jobs(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "jobstale@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    live, dead = (
+        client.post("/tasks/jobs", headers=headers, json={"kind": "delete_tasks"}).json()["id"]
+        for _ in range(2)
+    )
+    # One job still run by a sibling process, one left behind by a dead one.
+    db_session.execute(text(
+        "UPDATE task_jobs SET status = 'running', owner = 'sibling', "
+        "heartbeat_at = CURRENT_TIMESTAMP WHERE id = :id"
+    ), {"id": live})
+    db_session.execute(text(
+        "UPDATE task_jobs SET status = 'running', owner = 'dead', "
+        "heartbeat_at = datetime(CURRENT_TIMESTAMP, '-1 hour') WHERE id = :id"
+    ), {"id": dead})
+    db_session.commit()
+
+    async def restart():
+        runner = TaskJobRunner([AsyncTestingSessionLocal], workers=0, poll_seconds=0.01)
+        await runner.start()
+        await runner.stop()
+
+    asyncio.run(restart())
+    assert client.get(f"/tasks/jobs/{live}", headers=headers).json()["status"] == "running"
+    assert client.get(f"/tasks/jobs/{dead}", headers=headers).json()["status"] == "queued"
+
+def test_stop_requeues_interrupted_jobs(client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_JOBS_BATCH_SIZE", 1)
+    monkeypatch.setattr(settings, "TASK_JOBS_BATCH_PAUSE_SECONDS", 10)
+    token = get_auth_token(client, "jobstop@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/tasks/bulk", headers=headers, json=[{"title": f"Job {i}"} for i in range(3)])
+    job_id = client.post("/tasks/jobs", headers=headers, json={"kind": "delete_tasks"}).json()["id"]
+
+    async def interrupt():
+        runner = _runner()
+        await runner.start()
+        runner.wake()
+        try:
+            # Stop while the job sleeps between its first and second batch.
+            for _ in range(200):
+                async with AsyncTestingSessionLocal() as db:
+                    if await db.scalar(select(TaskJob.processed).where(TaskJob.id == job_id)):
+                        return
+                await asyncio.sleep(0.01)
+        finally:
+            await runner.stop()
+
+    asyncio.run(interrupt())
+    db_session.expire_all()
+    job = db_session.get(TaskJob, job_id)
+    assert (job.status, job.processed, job.owner, job.heartbeat_at) == ("queued", 1, None, None)
+
+    monkeypatch.setattr(settings, "TASK_JOBS_BATCH_PAUSE_SECONDS", 0)
+    assert asyncio.run(_runner().run_pending()) == 1
+    job = client.get(f"/tasks/jobs/{job_id}", headers=headers).json()
+    assert (job["status"], job["total"], job["processed"]) == ("succeeded", 2, 2)
+
+def test_unexpected_errors_fail_the_job_not_the_worker(
+    client: TestClient, db_session: Session, monkeypatch
+):
+    token = get_auth_token(client, "jobcrash@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/tasks", headers=headers, json={"title": "Survivor"})
+
+    async def broken_count(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(Taskservice, "count_user_tasks", broken_count)
+    job_id = client.post("/tasks/jobs", headers=headers, json={"kind": "delete_tasks"}).json()["id"]
+    assert asyncio.run(_runner().run_pending()) == 1
+    job = client.get(f"/tasks/jobs/{job_id}", headers=headers).json()
+    assert (job["status"], job["error"]) == ("failed", "boom")
+    monkeypatch.undo()
+
+    claim_next_job = TaskJobService.claim_next_job
+    calls = []
+
+    async def flaky_claim(db, owner):
+        calls.append(owner)
+        if len(calls) == 1:
+            raise RuntimeError("claim failed")
+        return await claim_next_job(db, owner)
+
+    monkeypatch.setattr(TaskJobService, "claim_next_job", flaky_claim)
+    job_id = client.post("/tasks/jobs", headers=headers, json={"kind": "delete_tasks"}).json()["id"]
+
+    async def run_in_pool():
+        runner = TaskJobRunner([AsyncTestingSessionLocal], workers=1, poll_seconds=0.01)
+        await runner.start()
+        try:
+            for _ in range(200):
+                async with AsyncTestingSessionLocal() as db:
+                    if await db.scalar(select(TaskJob.status).where(TaskJob.id == job_id)) in (
+                        "succeeded", "failed"
+                    ):
+                        return
+                await asyncio.sleep(0.01)
+        finally:
+            await runner.stop()
+
+    asyncio.run(run_in_pool())
+    assert client.get(f"/tasks/jobs/{job_id}", headers=headers).json()["status"] == "succeeded"
+
+def test_job_validation_and_limits(client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_JOBS_MAX_PENDING_PER_USER", 1)
+    token = get_auth_token(client, "joblimits@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post("/tasks/jobs", headers=headers, json={"kind": "update_status"})
+    assert response.status_code == 422
+    response = client.post("/tasks/jobs", headers=headers, json={"kind": "export"})
+    assert response.status_code == 422
+
+    job = client.post("/tasks/jobs", headers=headers, json={"kind": "delete_tasks"}).json()
+    response = client.post("/tasks/jobs", headers=headers, json={"kind": "delete_tasks"})
+    assert response.status_code == 429
+
+    other = get_auth_token(client, "jobintruder@example.com", "testpassword")
+    response = client.get(f"/tasks/jobs/{job['id']}", headers={"Authorization": f"Bearer {other}"})
+    assert response.status_code == 404
@@ -1,8 +1,16 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.models.task import Task
 from app.models.user import User
+from app.services.task_service import Taskservice
+from app.tests.conftest import run_in_session
 from app.util.enum import TaskStatus
+from app.core.config import settings
 
 def get_auth_token(client: TestClient, email: str, password: str):
     client.post("/auth/register", json={"email": email, "password": password})
@@ -201,9 +209,15 @@ def test_delete_task(client: TestClient, db_session: Session):
     assert response.status_code == 200
     assert response.json()["message"] == "Task deleted successfully"
 
-    # Verify in DB
+    # Verify in DB: the row stays behind as a tombstone for delta sync
     deleted_task = db_session.query(Task).filter(Task.id == task_id).first()
-    assert deleted_task is None
+    assert deleted_task.deleted_at is not None
+
+    response = client.get(
+        f"/tasks/{task_id}",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 404
 
 def test_delete_task_other_user(client: TestClient, db_session: Session):
     # User 1 creates a task
@@ -224,3 +238,522 @@ def test_delete_task_other_user(client: TestClient, db_session: Session):
     assert response.status_code == 404 # Should be 404 because task not found for this user
     assert response.json()["detail"] == "Task not found"
 
+
+def test_list_tasks_pagination(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "pageuser@example.com", "testpassword")
+    for i in range(5):
+        client.post(
+            "/tasks",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"title": f"Page Task {i}", "description": "Paged"}
+        )
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(
+            "/tasks",
+            headers={"Authorization": f"Bearer {token}"},
+            params=params
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(task["id"] for task in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+
+def test_list_tasks_invalid_cursor(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "badcursor@example.com", "testpassword")
+    response = client.get(
+        "/tasks",
+        headers={"Authorization": f"Bearer {token}"},
+        params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_bulk_create_update_delete(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "bulkuser@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post(
+        "/tasks/bulk",
+        headers=headers,
+        json=[{"title": f"Bulk {i}", "description": f"Desc {i}"} for i in range(3)]
+    )
+    assert response.status_code == 200
+    created = response.json()
+    assert [item["status"] for item in created] == ["created"] * 3
+    assert [item["task"]["title"] for item in created] == ["Bulk 0", "Bulk 1", "Bulk 2"]
+    ids = [item["id"] for item in created]
+
+    other_token = get_auth_token(client, "bulkother@example.com", "testpassword")
+    other = client.post(
+        "/tasks",
+        headers={"Authorization": f"Bearer {other_token}"},
+        json={"title": "Not yours"}
+    ).json()
+
+    response = client.patch(
+        "/tasks/bulk",
+        headers=headers,
+        json=[
+            {"id": ids[0], "status": TaskStatus.completed.value},
+            {"id": ids[1], "title": "Renamed"},
+            {"id": other["id"], "title": "Hijacked"},
+        ]
+    )
+    assert response.status_code == 200
+    updated = response.json()
+    assert [item["status"] for item in updated] == ["updated", "updated", "not_found"]
+    assert updated[0]["task"]["status"] == TaskStatus.completed.value
+    assert updated[0]["task"]["title"] == "Bulk 0"
+    assert updated[1]["task"]["title"] == "Renamed"
+    assert updated[1]["task"]["description"] == "Desc 1"
+    assert db_session.query(Task).filter(Task.id == other["id"]).first().title == "Not yours"
+
+    response = client.request(
+        "DELETE",
+        "/tasks/bulk",
+        headers=headers,
+        json={"ids": [ids[2], other["id"]]}
+    )
+    assert response.status_code == 200
+    assert [item["status"] for item in response.json()] == ["deleted", "not_found"]
+    assert db_session.query(Task).filter(Task.id == ids[2]).first().deleted_at is not None
+    assert db_session.query(Task).filter(Task.id == other["id"]).first().deleted_at is None
+
+def test_search_tasks(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "searcher@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/tasks", headers=headers, json={"title": "Buy groceries", "description": "milk and eggs"})
+    client.post("/tasks", headers=headers, json={"title": "Write report", "description": "quarterly numbers"})
+    renamed = client.post("/tasks", headers=headers, json={"title": "Old name"}).json()
+    client.put(f"/tasks/{renamed['id']}", headers=headers, json={"title": "Grocery list"})
+
+    other_token = get_auth_token(client, "othersearcher@example.com", "testpassword")
+    client.post(
+        "/tasks",
+        headers={"Authorization": f"Bearer {other_token}"},
+        json={"title": "Groceries for someone else"}
+    )
+
+    response = client.get("/tasks/search", headers=headers, params={"q": "grocer"})
+    assert response.status_code == 200
+    titles = {task["title"] for task in response.json()}
+    assert titles == {"Buy groceries", "Grocery list"}
+
+    response = client.get("/tasks/search", headers=headers, params={"q": "eggs"})
+    assert [task["title"] for task in response.json()] == ["Buy groceries"]
+
+    response = client.get("/tasks/search", headers=headers, params={"q": "old"})
+    assert response.json() == []
+
+    response = client.get("/tasks/search", headers=headers, params={"q": '"AND('})
+    assert response.status_code == 200
+
+def test_status_filter_and_stats(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "statsuser@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    ids = [
+        client.post("/tasks", headers=headers, json={"title": f"Stats {i}"}).json()["id"]
+        for i in range(4)
+    ]
+    client.put(f"/tasks/{ids[0]}", headers=headers, json={"status": TaskStatus.completed.value})
+    client.patch("/tasks/bulk", headers=headers, json=[{"id": ids[1], "status": TaskStatus.completed.value}])
+    client.delete(f"/tasks/{ids[3]}", headers=headers)
+
+    response = client.get("/tasks/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"pending": 1, "completed": 2, "total": 3}
+
+    response = client.get("/tasks", headers=headers, params={"status": TaskStatus.completed.value})
+    assert sorted(task["id"] for task in response.json()) == sorted(ids[:2])
+
+    response = client.get("/tasks", headers=headers, params={"status": TaskStatus.pending.value})
+    assert [task["id"] for task in response.json()] == [ids[2]]
+
+def test_conditional_get(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "etaguser@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    task_id = client.post("/tasks", headers=headers, json={"title": "Cached"}).json()["id"]
+
+    response = client.get("/tasks", headers=headers)
+    etag = response.headers["ETag"]
+    response = client.get("/tasks", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    single = client.get(f"/tasks/{task_id}", headers=headers)
+    single_etag = single.headers["ETag"]
+    assert single_etag != etag
+    response = client.get(f"/tasks/{task_id}", headers={**headers, "If-None-Match": single_etag})
+    assert response.status_code == 304
+    response = client.get(f"/tasks/{task_id}", headers={**headers, "If-None-Match": "*"})
+    assert response.status_code == 304
+    response = client.get("/tasks/999999", headers={**headers, "If-None-Match": "*"})
+    assert response.status_code == 404
+
+    limited = client.get("/tasks", headers={**headers, "If-None-Match": etag}, params={"limit": 1})
+    assert limited.status_code == 200
+
+    client.put(f"/tasks/{task_id}", headers=headers, json={"title": "Changed"})
+    response = client.get("/tasks", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["title"] == "Changed"
+
+def test_list_tasks_fast_json_matches_default(client: TestClient, db_session: Session, monkeypatch):
+    token = get_auth_token(client, "fastjson@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/tasks", headers=headers, json={"title": "Fast 1", "description": "ünïcode"})
+    client.post("/tasks", headers=headers, json={"title": "Fast 2"})
+    client.post("/tasks", headers=headers, json={"title": "Fast 3"})
+
+    default = client.get("/tasks", headers=headers, params={"limit": 2})
+    monkeypatch.setattr(settings, "TASKS_FAST_JSON", True)
+    fast = client.get("/tasks", headers=headers, params={"limit": 2})
+
+    assert fast.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.content == default.content
+    assert fast.headers["X-Next-Cursor"] == default.headers["X-Next-Cursor"]
+    assert fast.headers["ETag"] == default.headers["ETag"]
+
+def test_archive_completed_tasks(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "archive@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    ids = [
+        client.post("/tasks", headers=headers, json={"title": f"Archive {i}"}).json()["id"]
+        for i in range(4)
+    ]
+    for task_id in ids[:3]:
+        client.put(f"/tasks/{task_id}", headers=headers, json={"status": "completed"})
+    db_session.execute(
+        text("UPDATE tasks SET created_at = '2000-01-01 00:00:00' WHERE id IN (:a, :b)"),
+        {"a": ids[0], "b": ids[1]}
+    )
+    db_session.commit()
+
+    older_than = datetime.now(timezone.utc) - timedelta(days=1)
+    assert [
+        run_in_session(Taskservice.archive_completed_tasks, older_than, 1) for _ in range(3)
+    ] == [1, 1, 0]
+
+    live = client.get("/tasks", headers=headers).json()
+    assert [task["id"] for task in live] == [ids[3], ids[2]]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 3, "include_archived": "true"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/tasks", headers=headers, params=params)
+        assert response.status_code == 200
+        seen.extend(task["id"] for task in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == [ids[3], ids[2], ids[1], ids[0]]
+
+    # Archiving moves tasks, it doesn't remove them from the counts.
+    stats = client.get("/tasks/stats", headers=headers).json()
+    assert stats == {"pending": 1, "completed": 3, "total": 4}
+    client.delete(f"/tasks/{ids[2]}", headers=headers)
+    stats = client.get("/tasks/stats", headers=headers).json()
+    assert stats == {"pending": 1, "completed": 2, "total": 3}
+
+def test_export_tasks(client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "TASKS_EXPORT_CHUNK_SIZE", 2)
+    token = get_auth_token(client, "export@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(5):
+        client.post("/tasks", headers=headers, json={"title": f"Export {i}", "description": "a,\"b\"\nc"})
+    listed = client.get("/tasks", headers=headers).json()
+
+    response = client.get("/tasks/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == listed
+
+    response = client.get("/tasks/export", headers=headers, params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == [task["title"] for task in listed]
+    assert rows[0]["description"] == "a,\"b\"\nc"
+
+    response = client.get("/tasks/export", headers=headers, params={"format": "xml"})
+    assert response.status_code == 422
+
+def test_import_tasks(client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "TASKS_IMPORT_BATCH_SIZE", 2)
+    token = get_auth_token(client, "import@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    body = "\n".join([
+        '{"title": "One", "description": "first"}',
+        '{"title": "Two", "status": "completed"}',
+        'not json',
+        '',
+        '{"title": "   "}',
+        '{"title": "Three"}',
+    ])
+    response = client.post(
+        "/tasks/import",
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+        content=body.encode()
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (3, 2)
+    assert [error["line"] for error in summary["errors"]] == [3, 5]
+
+    csv_body = 'title,description,status\nFour,"multi\nline, ""quoted""",completed\n,missing title,\nFive,,\n'
+    response = client.post(
+        "/tasks/import",
+        headers=headers,
+        files={"file": ("tasks.csv", csv_body.encode(), "text/csv")}
+    )
+    assert response.status_code == 200, response.text
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (2, 1)
+    assert summary["errors"][0]["line"] == 4
+
+    tasks = {task["title"]: task for task in client.get("/tasks", headers=headers).json()}
+    assert set(tasks) == {"One", "Two", "Three", "Four", "Five"}
+    assert tasks["Two"]["status"] == "completed"
+    assert tasks["Four"]["description"] == 'multi\nline, "quoted"'
+    assert tasks["Five"]["description"] is None
+
+    exported = client.get("/tasks/export", headers=headers, params={"format": "csv"})
+    response = client.post(
+        "/tasks/import",
+        headers={**headers, "Content-Type": "text/csv"},
+        content=exported.content
+    )
+    assert response.json()["imported"] == 5
+
+def test_import_limits_line_length(client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "TASKS_IMPORT_MAX_LINE_BYTES", 100)
+    token = get_auth_token(client, "importlimit@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    body = "\n".join([
+        '{"title": "Before"}',
+        '{"title": "' + "x" * 200_000 + '"}',
+        '{"title": "After"}',
+    ])
+    response = client.post(
+        "/tasks/import",
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+        content=body.encode()
+    )
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (2, 1)
+    assert summary["errors"] == [{"line": 2, "error": "Line is too long"}]
+
+    # A quoted field that never closes swallows the rest of the body, but
+    # fails once, and is not kept beyond the limit.
+    csv_body = 'title,description\nOk,\nOpen,"never closed\n' + "more,text\n" * 10_000
+    response = client.post(
+        "/tasks/import",
+        headers={**headers, "Content-Type": "text/csv"},
+        content=csv_body.encode()
+    )
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (1, 1)
+    assert summary["errors"] == [{"line": 3, "error": "Invalid CSV: unterminated quoted field"}]
+
+    csv_body = 'title,description\nLong,"' + "y\n" * 100 + '"\nShort,\n'
+    response = client.post(
+        "/tasks/import",
+        headers={**headers, "Content-Type": "text/csv"},
+        content=csv_body.encode()
+    )
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (1, 1)
+    assert summary["errors"] == [{"line": 2, "error": "Record is too long"}]
+
+def test_task_changes_feed(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "changes@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    ids = [
+        client.post("/tasks", headers=headers, json={"title": f"Sync {i}"}).json()["id"]
+        for i in range(3)
+    ]
+
+    response = client.get("/tasks/changes", headers=headers, params={"limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+    assert [change["id"] for change in page["changes"]] == ids[:2]
+    assert page["has_more"] is True
+    response = client.get("/tasks/changes", headers=headers, params={"since": page["cursor"]})
+    page = response.json()
+    assert [change["id"] for change in page["changes"]] == ids[2:]
+    assert page["has_more"] is False
+    cursor = page["cursor"]
+
+    client.put(f"/tasks/{ids[0]}", headers=headers, json={"status": "completed"})
+    client.delete(f"/tasks/{ids[1]}", headers=headers)
+    other = get_auth_token(client, "changes-other@example.com", "testpassword")
+    client.post("/tasks", headers={"Authorization": f"Bearer {other}"}, json={"title": "Not mine"})
+
+    page = client.get("/tasks/changes", headers=headers, params={"since": cursor}).json()
+    assert page["changes"] == [
+        {"id": ids[0], "deleted": False, "task": page["changes"][0]["task"]},
+        {"id": ids[1], "deleted": True, "task": None},
+    ]
+    assert page["changes"][0]["task"]["status"] == "completed"
+    assert page["changes"][0]["task"]["updated_at"] is not None
+    response = client.get("/tasks/changes", headers=headers, params={"since": page["cursor"]})
+    assert response.json()["changes"] == []
+
+    # A fresh sync never sees tombstones.
+    page = client.get("/tasks/changes", headers=headers).json()
+    assert sorted(change["id"] for change in page["changes"]) == [ids[0], ids[2]]
+
+    db_session.execute(
+        text("UPDATE tasks SET deleted_at = '2000-01-01 00:00:00' WHERE id = :id"),
+        {"id": ids[1]}
+    )
+    db_session.commit()
+
+    older_than = datetime.now(timezone.utc) - timedelta(days=1)
+    assert run_in_session(Taskservice.compact_tombstones, older_than, 10) == 1
+    assert db_session.query(Task).filter(Task.id == ids[1]).first() is None
+    response = client.get("/tasks/changes", headers=headers, params={"since": cursor})
+    assert response.status_code == 410
+    response = client.get("/tasks/changes", headers=headers, params={"since": "garbage"})
+    assert response.status_code == 400
+
+def test_task_changes_survive_other_users_compaction(client: TestClient, db_session: Session):
+    quiet = {"Authorization": f"Bearer {get_auth_token(client, 'quiet@example.com', 'testpassword')}"}
+    empty = {"Authorization": f"Bearer {get_auth_token(client, 'empty@example.com', 'testpassword')}"}
+    busy = {"Authorization": f"Bearer {get_auth_token(client, 'busy@example.com', 'testpassword')}"}
+    client.post("/tasks", headers=quiet, json={"title": "Quiet"})
+
+    quiet_cursor = client.get("/tasks/changes", headers=quiet).json()["cursor"]
+    empty_cursor = client.get("/tasks/changes", headers=empty).json()["cursor"]
+
+    task_id = client.post("/tasks", headers=busy, json={"title": "Gone"}).json()["id"]
+    client.post("/tasks", headers=busy, json={"title": "Newest"})
+    client.delete(f"/tasks/{task_id}", headers=busy)
+    db_session.execute(
+        text("UPDATE tasks SET deleted_at = '2000-01-01 00:00:00' WHERE id = :id"), {"id": task_id}
+    )
+    db_session.commit()
+
+    older_than = datetime.now(timezone.utc) - timedelta(days=1)
+    assert run_in_session(Taskservice.compact_tombstones, older_than, 10) == 1
+    for headers, cursor in ((quiet, quiet_cursor), (empty, empty_cursor)):
+        response = client.get("/tasks/changes", headers=headers, params={"since": cursor})
+        assert response.status_code == 200
+        assert response.json()["changes"] == []
+        # And again from the cursor that sync returned.
+        response = client.get(
+            "/tasks/changes", headers=headers, params={"since": response.json()["cursor"]}
+        )
+        assert response.status_code == 200
+
+    # A full sync after the compaction can be followed by an incremental one.
+    cursor = client.get("/tasks/changes", headers=quiet).json()["cursor"]
+    response = client.get("/tasks/changes", headers=quiet, params={"since": cursor})
+    assert response.status_code == 200
+
+def test_full_sync_after_own_compaction(client: TestClient, db_session: Session):
+    headers = {"Authorization": f"Bearer {get_auth_token(client, 'resync@example.com', 'testpassword')}"}
+    gone = client.post("/tasks", headers=headers, json={"title": "Gone"}).json()["id"]
+    ids = [
+        client.post("/tasks", headers=headers, json={"title": f"Resync {i}"}).json()["id"]
+        for i in range(3)
+    ]
+    client.delete(f"/tasks/{gone}", headers=headers)
+    db_session.execute(
+        text("UPDATE tasks SET deleted_at = '2000-01-01 00:00:00' WHERE id = :id"), {"id": gone}
+    )
+    db_session.commit()
+    older_than = datetime.now(timezone.utc) - timedelta(days=1)
+    assert run_in_session(Taskservice.compact_tombstones, older_than, 10) == 1
+
+    # Every live row is below the compaction mark, yet the later pages of a
+    # full sync and the incremental sync after it still go through.
+    page = client.get("/tasks/changes", headers=headers, params={"limit": 2}).json()
+    seen = [change["id"] for change in page["changes"]]
+    while page["has_more"]:
+        response = client.get(
+            "/tasks/changes", headers=headers, params={"limit": 2, "since": page["cursor"]}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(change["id"] for change in page["changes"])
+    assert seen == ids
+    response = client.get("/tasks/changes", headers=headers, params={"since": page["cursor"]})
+    assert response.status_code == 200
+    assert response.json()["changes"] == []
+
+    # An empty full sync, for a user whose only task was compacted away.
+    emptied = {"Authorization": f"Bearer {get_auth_token(client, 'emptied@example.com', 'testpassword')}"}
+    gone = client.post("/tasks", headers=emptied, json={"title": "Gone"}).json()["id"]
+    client.delete(f"/tasks/{gone}", headers=emptied)
+    client.post("/tasks", headers=headers, json={"title": "Newest"})
+    db_session.execute(
+        text("UPDATE tasks SET deleted_at = '2000-01-01 00:00:00' WHERE id = :id"), {"id": gone}
+    )
+    db_session.commit()
+    assert run_in_session(Taskservice.compact_tombstones, older_than, 10) == 1
+    page = client.get("/tasks/changes", headers=emptied).json()
+    assert page["changes"] == []
+    response = client.get("/tasks/changes", headers=emptied, params={"since": page["cursor"]})
+    assert response.status_code == 200
+
+def test_sparse_fieldsets(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "fields@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    ids = [
+        client.post(
+            "/tasks", headers=headers, json={"title": f"Field {i}", "description": "x" * 1000}
+        ).json()["id"]
+        for i in range(3)
+    ]
+
+    response = client.get(
+        "/tasks", headers=headers, params={"fields": "status,id,title,id", "limit": 2}
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": ids[2], "title": "Field 2", "status": "pending"},
+        {"id": ids[1], "title": "Field 1", "status": "pending"},
+    ]
+    response = client.get(
+        "/tasks",
+        headers=headers,
+        params={"fields": "title", "cursor": response.headers["X-Next-Cursor"]}
+    )
+    assert response.json() == [{"title": "Field 0"}]
+    response = client.get(
+        "/tasks", headers=headers, params={"fields": "title", "include_archived": "true"}
+    )
+    assert response.json() == [{"title": f"Field {i}"} for i in (2, 1, 0)]
+
+    full = client.get(f"/tasks/{ids[0]}", headers=headers)
+    response = client.get(f"/tasks/{ids[0]}", headers=headers, params={"fields": "id,status"})
+    assert response.status_code == 200
+    assert response.json() == {"id": ids[0], "status": "pending"}
+    assert response.headers["ETag"] != full.headers["ETag"]
+
+    response = client.get(f"/tasks/{ids[0]}", headers=headers, params={"fields": "id,secret"})
+    assert response.status_code == 422
+    response = client.get("/tasks", headers=headers, params={"fields": ""})
+    assert response.status_code == 422
+    response = client.get("/tasks/999999", headers=headers, params={"fields": "id"})
+    assert response.status_code == 404
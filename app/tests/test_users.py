@@ -2,6 +2,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.routers.auth import create_access_token
+from app.core.cache import principal_cache
+from app.services.user_service import UserService
+from app.tests.conftest import run_in_session
 
 def get_auth_token(client: TestClient, email: str, password: str):
     client.post("/auth/register", json={"email": email, "password": password})
@@ -30,3 +33,39 @@ def test_read_users_me_unauthenticated(client: TestClient):
     assert response.status_code == 401
     assert response.json()["detail"] == "Not authenticated"
 
+
+def test_read_users_me_uses_principal_cache(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "cached@example.com", "testpassword")
+    user = db_session.query(User).filter(User.email == "cached@example.com").first()
+    principal_cache.invalidate(user.id)
+
+    hits, misses = principal_cache.hits, principal_cache.misses
+    for _ in range(3):
+        response = client.get(
+            "/users/me",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+        assert response.json()["email"] == "cached@example.com"
+
+    assert principal_cache.misses - misses == 1
+    assert principal_cache.hits - hits == 2
+
+    principal_cache.invalidate(user.id)
+    assert principal_cache.get(user.id) is None
+
+
+def test_set_active_takes_effect_despite_principal_cache(client: TestClient, db_session: Session):
+    token = get_auth_token(client, "deactivate@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    user = db_session.query(User).filter(User.email == "deactivate@example.com").first()
+    assert client.get("/users/me", headers=headers).status_code == 200
+    assert principal_cache.get(user.id) is not None
+
+    run_in_session(UserService.set_active, user.id, False)
+    response = client.get("/users/me", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "User is not active"
+
+    run_in_session(UserService.set_active, user.id, True)
+    assert client.get("/users/me", headers=headers).status_code == 200
@@ -0,0 +1,21 @@
+import asyncio
+from sqlalchemy import text
+from app.core.metrics import app_warmup_duration
+from app.services import warmup_service
+from app.services.warmup_service import WarmupService
+from app.tests.conftest import async_engine
+
+def test_warmup_leaves_no_rows_behind(db_session, monkeypatch):
+    monkeypatch.setattr(warmup_service, "engine", async_engine)
+    monkeypatch.setattr(warmup_service, "read_engine", async_engine)
+
+    async def run():
+        await WarmupService.run()
+        async with async_engine.connect() as conn:
+            return [
+                (await conn.execute(text(f"SELECT COUNT(*) FROM {table}"))).scalar()
+                for table in ("tasks", "task_status_counts", "task_versions")
+            ]
+
+    assert asyncio.run(run()) == [0, 0, 0]
+    assert any(line.startswith("app_warmup_seconds ") for line in app_warmup_duration.collect())
@@ -3,3 +3,13 @@ from enum import Enum
 class TaskStatus(str, Enum):
     pending = "pending"
     completed = "completed"
+
+class TaskJobKind(str, Enum):
+    delete_tasks = "delete_tasks"
+    update_status = "update_status"
+
+class TaskJobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
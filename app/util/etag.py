@@ -0,0 +1,17 @@
+import hashlib
+
+
+def make_etag(version: int, *parts) -> str:
+    # The version changes on every write; the digest distinguishes the
+    # different representations (query string, task id, user) at a version.
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
@@ -0,0 +1,29 @@
+import csv
+import io
+from datetime import datetime
+from app.schemas.task import TaskRow, task_row_adapter
+
+EXPORT_FIELDS = list(TaskRow.__annotations__)
+
+# Each function turns an async iterator of row chunks into an async iterator
+# of encoded chunks, so a StreamingResponse never holds more than one chunk.
+
+async def ndjson_chunks(partitions):
+    async for rows in partitions:
+        yield b"".join(task_row_adapter.dump_json(row._asdict()) + b"\n" for row in rows)
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+async def csv_chunks(partitions):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    async for rows in partitions:
+        writer.writerows(
+            [_csv_value(getattr(row, field)) for field in EXPORT_FIELDS]
+            for row in rows
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
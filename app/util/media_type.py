@@ -0,0 +1,32 @@
+def choose_media_type(accept: str, offered: list[str]) -> str | None:
+    """Pick the offered media type the Accept header prefers, honouring q-values.
+
+    Each offered type takes the quality of the most specific range that
+    matches it (type/subtype, then type/*, then */*). Ties go to the more
+    specific match, then to the earlier offer, so list the default first.
+    """
+    ranges = {}
+    for item in accept.split(","):
+        media_range, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_range.strip():
+            ranges[media_range.strip().lower()] = quality
+    best = None
+    for media_type in offered:
+        main_type = media_type.split("/")[0]
+        for specificity, media_range in ((2, media_type), (1, f"{main_type}/*"), (0, "*/*")):
+            if media_range in ranges:
+                quality = ranges[media_range]
+                break
+        else:
+            continue
+        if quality > 0 and (best is None or (quality, specificity) > best[1:]):
+            best = (media_type, quality, specificity)
+    return best[0] if best else None
@@ -0,0 +1,35 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), task_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        created_at, task_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+# "c" marks a cursor into the incremental feed, "f" one into the pages of a
+# full sync that is still in progress.
+def encode_change_cursor(change_seq: int, task_id: int, full_sync: bool = False) -> str:
+    raw = json.dumps(["f" if full_sync else "c", change_seq, task_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_change_cursor(cursor: str) -> tuple[int, int, bool]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        kind, change_seq, task_id = json.loads(raw)
+        if kind not in ("c", "f"):
+            raise ValueError
+        return int(change_seq), int(task_id), kind == "f"
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+from starlette.datastructures import UploadFile
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Streaming parsers for POST /tasks/import. Each stage is an async iterator
+# over the previous one, so only the current line or record is in memory, and
+# neither may grow past TASKS_IMPORT_MAX_LINE_BYTES.
+
+async def upload_chunks(upload: UploadFile):
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+async def iter_lines(chunks, max_line_bytes: int):
+    """Yields each line, or None in place of a line over max_line_bytes.
+
+    Lines are split as bytes, which is safe since "\n" never occurs inside a
+    multibyte UTF-8 sequence, and the pieces of a partial line are kept in a
+    list, so a long line is joined once rather than on every chunk. An
+    over-long line is dropped as it arrives, up to the next newline.
+    """
+    pieces, size, skipping = [], 0, False
+    first = True
+    async for chunk in chunks:
+        # Split on "\n" only: str.splitlines would also break JSON strings
+        # holding U+2028 and friends. The last piece may be a partial line.
+        *ends, rest = chunk.split(b"\n")
+        for end in ends:
+            if not skipping and size + len(end) <= max_line_bytes:
+                pieces.append(end)
+                line = b"".join(pieces).decode("utf-8-sig" if first else "utf-8")
+                yield line + "\n"
+            else:
+                yield None
+            first = False
+            pieces, size, skipping = [], 0, False
+        if skipping:
+            continue
+        size += len(rest)
+        if size > max_line_bytes:
+            pieces, skipping = [], True
+        elif rest:
+            pieces.append(rest)
+    if skipping:
+        yield None
+    elif pieces:
+        yield b"".join(pieces).decode("utf-8-sig" if first else "utf-8")
+
+async def ndjson_records(lines):
+    """Yields (line number, dict) or (line number, error message)."""
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if line is None:
+            yield line_number, "Line is too long"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+        yield line_number, record
+
+async def csv_records(lines, max_record_bytes: int):
+    """Yields (line number, dict) or (line number, error message).
+
+    A quoted field may span lines; a record is complete once its quotes
+    balance, and is numbered by the line it starts on. A record over
+    max_record_bytes is dropped as it arrives, up to where its quotes balance.
+    """
+    header = None
+    # Quote parity is kept as lines arrive, so a long record is never rescanned.
+    record, size, quoted, start, line_number = [], 0, False, 0, 0
+    too_long = False
+    async for line in lines:
+        line_number += 1
+        if not record and not too_long:
+            start = line_number
+        if line is None:
+            # Its quotes are unknown; assume they balance.
+            too_long = True
+        else:
+            quoted ^= line.count('"') % 2 == 1
+            size += len(line.encode("utf-8"))
+            if size > max_record_bytes:
+                too_long = True
+        if too_long:
+            record = []
+            if not quoted:
+                yield start, "Record is too long"
+                size, too_long = 0, False
+            continue
+        record.append(line)
+        if quoted:
+            continue
+        text, record, size = "".join(record), [], 0
+        if not text.strip():
+            continue
+        try:
+            row = next(csv.reader(io.StringIO(text, newline="")))
+        except csv.Error as exc:
+            yield start, f"Invalid CSV: {exc}"
+            continue
+        if header is None:
+            header = [name.strip() for name in row]
+            continue
+        if len(row) != len(header):
+            yield start, f"Expected {len(header)} fields, got {len(row)}"
+            continue
+        # Empty CSV cells mean "not set", as in the export.
+        yield start, {name: value for name, value in zip(header, row) if value != ""}
+    if record or too_long:
+        yield start, "Invalid CSV: unterminated quoted field"
@@ -0,0 +1,62 @@
+import random
+from dataclasses import dataclass, field
+
+from app.util.enum import TaskStatus
+
+WORDS = (
+    "report review invoice meeting deploy refactor groceries call email plan "
+    "budget design test release backup migrate sync draft publish archive"
+).split()
+
+
+@dataclass
+class SeededUser:
+    email: str
+    password: str
+    token: str = ""
+    task_ids: list[int] = field(default_factory=list)
+
+
+class DataGenerator:
+    """Deterministic users and tasks for a given seed."""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.random = random.Random(seed)
+
+    def user(self, index: int, prefix: str = "user") -> SeededUser:
+        return SeededUser(
+            email=f"bench-{prefix}-{self.seed}-{index}@example.com",
+            password=f"bench-password-{index}"
+        )
+
+    def task(self) -> dict:
+        title = " ".join(self.random.choices(WORDS, k=self.random.randint(2, 5)))
+        description = " ".join(self.random.choices(WORDS, k=self.random.randint(0, 40)))
+        return {"title": title.capitalize(), "description": description or None}
+
+    def status(self) -> str:
+        return self.random.choice(list(TaskStatus)).value
+
+
+async def seed(client, generator: DataGenerator, users: int, tasks_per_user: int, chunk: int = 200):
+    """Create users and their tasks through the public API."""
+    seeded = []
+    for index in range(users):
+        user = generator.user(index)
+        credentials = {"email": user.email, "password": user.password}
+        await client.post("/auth/register", json=credentials)
+        response = await client.post("/auth/login", json=credentials)
+        response.raise_for_status()
+        user.token = response.json()["access_token"]
+
+        headers = {"Authorization": f"Bearer {user.token}"}
+        remaining = tasks_per_user
+        while remaining > 0:
+            batch = [generator.task() for _ in range(min(chunk, remaining))]
+            response = await client.post("/tasks/bulk", headers=headers, json=batch)
+            response.raise_for_status()
+            user.task_ids.extend(item["id"] for item in response.json())
+            remaining -= len(batch)
+        seeded.append(user)
+    return seeded
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from benchmarks.stats import summarize
+
+# One mutable counter per in-flight request. SQLAlchemy runs cursor
+# execution in a greenlet that inherits the calling task's context, so the
+# listener below sees the counter of the request that issued the query.
+_query_count: ContextVar[list | None] = ContextVar("benchmark_query_count", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def install_query_counter(*engines):
+    for engine in {id(engine): engine for engine in engines}.values():
+        event.listen(engine.sync_engine, "before_cursor_execute", _count_query)
+
+
+async def run_scenario(client, scenario, context, requests: int, concurrency: int, count_queries: bool):
+    latencies, query_counts = [], []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            counter = [0]
+            token = _query_count.set(counter)
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, context, index)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            finally:
+                latencies.append(time.perf_counter() - start)
+                _query_count.reset(token)
+            query_counts.append(counter[0])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "requests": requests,
+        "errors": errors,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+        **summarize(latencies),
+        "db_queries_per_request": None,
+    }
+    if count_queries and query_counts:
+        result["db_queries_per_request"] = {
+            "mean": round(sum(query_counts) / len(query_counts), 2),
+            "max": max(query_counts),
+        }
+    return result
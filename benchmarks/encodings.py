@@ -0,0 +1,95 @@
+"""Task list encodings: response size and CPU per layout and compression.
+
+Encodes a page of tasks as the default row JSON (one object per task) and
+as the columnar layout (Accept: application/vnd.tasks.columnar+json), then
+compresses each with gzip and deflate through the same compressor the
+CompressionMiddleware uses.
+
+    python -m benchmarks.encodings --sizes 1000 10000
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from app.core.config import settings
+from app.middleware.compression import compressor
+from app.schemas.task import TASK_FIELDS, task_columns_adapter, task_rows_adapter
+
+
+def _rows(count):
+    start = datetime(2026, 1, 1)
+    return [
+        {
+            "id": i,
+            "title": f"Task {i}",
+            "description": "x" * 80 if i % 2 else None,
+            "status": "completed" if i % 3 == 0 else "pending",
+            "user_id": 1,
+            "created_at": start + timedelta(seconds=i),
+            "updated_at": start + timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+def rows_layout(rows):
+    return task_rows_adapter.dump_json(rows)
+
+
+def columnar_layout(rows):
+    return task_columns_adapter(TASK_FIELDS).dump_json(
+        {name: [row[name] for row in rows] for name in TASK_FIELDS}
+    )
+
+
+def _compress(encoding, body):
+    compress = compressor(encoding, settings.RESPONSE_COMPRESSION_LEVEL)
+    return compress.compress(body) + compress.flush()
+
+
+def _best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main(sizes, repeat):
+    results = []
+    for size in sizes:
+        rows = _rows(size)
+        for layout, encode in (("rows", rows_layout), ("columnar", columnar_layout)):
+            body, encode_s = _best_of(lambda: encode(rows), repeat)
+            results.append({
+                "tasks": size,
+                "layout": layout,
+                "encoding": "identity",
+                "bytes": len(body),
+                "encode_ms": round(encode_s * 1000, 3),
+                "compress_ms": 0.0,
+            })
+            for encoding in ("gzip", "deflate"):
+                compressed, compress_s = _best_of(lambda: _compress(encoding, body), repeat)
+                results.append({
+                    "tasks": size,
+                    "layout": layout,
+                    "encoding": encoding,
+                    "bytes": len(compressed),
+                    "encode_ms": round(encode_s * 1000, 3),
+                    "compress_ms": round(compress_s * 1000, 3),
+                })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
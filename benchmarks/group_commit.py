@@ -0,0 +1,92 @@
+"""POST /tasks write throughput with and without group commit.
+
+Runs the same burst of concurrent creates twice against a fresh database:
+once with one commit per request and once through the group-commit batcher,
+then prints throughput and p50/p99 latency for each. Set SQLITE_SYNCHRONOUS=FULL
+to include an fsync in every commit.
+
+    python -m benchmarks.group_commit --creates 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# Load tests log in far faster than any real client; keep admission control
+# from turning them into 429s unless explicitly enabled.
+os.environ.setdefault("AUTH_RATE_LIMIT_ENABLED", "false")
+_db_dir = tempfile.mkdtemp(prefix="task-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db"
+
+import httpx
+
+from app.core.config import settings
+from app.core.database import Base, engine
+from app.main import app
+from app.services.task_batcher import task_create_batcher
+from benchmarks.stats import summarize
+
+
+async def run(creates: int, concurrency: int, group_commit: bool):
+    # Pooled connections opened before drop_all/create_all can hit "database
+    # is locked" on the rebuilt schema; start every run on fresh ones.
+    await engine.dispose()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    settings.TASKS_GROUP_COMMIT_ENABLED = group_commit
+    credentials = {"email": "bench@example.com", "password": "benchpassword"}
+    # Pool timeouts surface as 500s and are counted instead of aborting the run.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json=credentials)
+        token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        samples = []
+        errors = 0
+        gate = asyncio.Semaphore(concurrency)
+
+        async def create(i):
+            nonlocal errors
+            async with gate:
+                start = time.perf_counter()
+                response = await client.post("/tasks/", headers=headers, json={"title": f"Task {i}"})
+                samples.append(time.perf_counter() - start)
+                if response.is_error:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(create(i) for i in range(creates)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "group_commit" if group_commit else "per_request",
+        "elapsed_s": round(elapsed, 3),
+        "creates_per_s": round((creates - errors) / elapsed, 1),
+        "errors": errors,
+        "create": summarize(samples),
+    }
+
+
+async def main(args):
+    task_create_batcher.window_seconds = args.window_ms / 1000
+    task_create_batcher.max_batch = args.max_batch
+    results = []
+    for group_commit in (False, True):
+        results.append(await run(args.creates, args.concurrency, group_commit))
+    await engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--creates", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, default=settings.TASKS_GROUP_COMMIT_WINDOW_MS)
+    parser.add_argument("--max-batch", type=int, default=settings.TASKS_GROUP_COMMIT_MAX_BATCH)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,117 @@
+"""Login vs. task-read latency under mixed load.
+
+Runs the same workload twice: once with Argon2 executed inline on the event
+loop (the old behaviour) and once through the bounded hash pool, then prints
+p50/p99 latency for logins and for concurrent GET /tasks calls.
+
+    python -m benchmarks.password_hashing --logins 40 --reads 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# Load tests log in far faster than any real client; keep admission control
+# from turning them into 429s unless explicitly enabled.
+os.environ.setdefault("AUTH_RATE_LIMIT_ENABLED", "false")
+_db_dir = tempfile.mkdtemp(prefix="task-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db"
+
+import httpx
+
+from app.core.database import Base, engine
+from app.main import app
+from app.services import user_service
+from benchmarks.stats import summarize
+
+
+
+async def _inline(func, *args):
+    return func(*args)
+
+
+async def _timed(samples, coro):
+    start = time.perf_counter()
+    response = await coro
+    samples.append(time.perf_counter() - start)
+    response.raise_for_status()
+
+
+def _interleave(first: list, second: list) -> list:
+    # Spread both lists evenly over the run: each job is placed at its
+    # relative position within its own list.
+    slots = [((i + 0.5) / len(first), 0, i) for i in range(len(first))]
+    slots += [((i + 0.5) / len(second), 1, i) for i in range(len(second))]
+    slots.sort()
+    return [(first, second)[which][i] for _, which, i in slots]
+
+
+async def run(logins: int, reads: int, concurrency: int, inline: bool):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    original = user_service.run_in_hash_pool
+    if inline:
+        user_service.run_in_hash_pool = _inline
+
+    credentials = {"email": "bench@example.com", "password": "benchpassword"}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/auth/register", json=credentials)
+            token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            for i in range(20):
+                await client.post("/tasks/", headers=headers, json={"title": f"Task {i}"})
+
+            login_samples, read_samples = [], []
+            gate = asyncio.Semaphore(concurrency)
+
+            async def guarded(samples, make):
+                async with gate:
+                    await _timed(samples, make())
+
+            # Interleave so logins and reads overlap for the whole run.
+            jobs = _interleave(
+                [
+                    guarded(login_samples, lambda: client.post("/auth/login", json=credentials))
+                    for _ in range(logins)
+                ],
+                [
+                    guarded(read_samples, lambda: client.get("/tasks/", headers=headers))
+                    for _ in range(reads)
+                ]
+            )
+
+            start = time.perf_counter()
+            await asyncio.gather(*jobs)
+            elapsed = time.perf_counter() - start
+    finally:
+        user_service.run_in_hash_pool = original
+
+    return {
+        "mode": "inline" if inline else "pool",
+        "elapsed_s": round(elapsed, 3),
+        "login": summarize(login_samples),
+        "list_tasks": summarize(read_samples),
+    }
+
+
+async def main(args):
+    results = []
+    for inline in (True, False):
+        results.append(await run(args.logins, args.reads, args.concurrency, inline))
+    await engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--reads", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,146 @@
+"""Endpoint load test: seeded data, scenario latencies and DB query counts.
+
+By default the app runs in-process over httpx's ASGI transport against a
+fresh aiosqlite database, which also allows counting SQL statements per
+request. --uvicorn starts a local uvicorn worker on its own fresh database
+instead, and --base-url targets a server that is already running (no
+query counts in either case).
+
+    python -m benchmarks.run --requests 500 --concurrency 32 --output run.json
+    python -m benchmarks.compare baseline.json run.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# Load tests log in far faster than any real client; keep admission control
+# from turning them into 429s unless explicitly enabled.
+os.environ.setdefault("AUTH_RATE_LIMIT_ENABLED", "false")
+_db_dir = tempfile.mkdtemp(prefix="task-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db"
+os.environ.pop("READ_DATABASE_URL", None)
+
+import httpx
+from sqlalchemy import create_engine
+
+from app.core.database import Base, engine, read_engine
+from app.main import app
+from benchmarks.data import DataGenerator, seed
+from benchmarks.driver import install_query_counter, run_scenario
+from benchmarks.scenarios import SCENARIOS, ScenarioContext
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_uvicorn():
+    # The server gets its own database file; create the schema up front.
+    url = f"sqlite:///{_db_dir}/server.db"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+    port = _free_port()
+    env = {**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{_db_dir}/server.db"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/docs", timeout=1)
+            return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def main(args):
+    process = None
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+        mode = "remote"
+    elif args.uvicorn:
+        process, base_url = _start_uvicorn()
+        client = httpx.AsyncClient(base_url=base_url, timeout=60)
+        mode = "uvicorn"
+    else:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        install_query_counter(engine, read_engine)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60
+        )
+        mode = "in-process"
+
+    generator = DataGenerator(args.seed)
+    results = {}
+    try:
+        async with client:
+            users = await seed(client, generator, args.users, args.tasks_per_user)
+            context = ScenarioContext(generator, users, run_id=uuid.uuid4().hex[:8])
+            for name in args.scenarios:
+                results[name] = await run_scenario(
+                    client,
+                    SCENARIOS[name],
+                    context,
+                    requests=args.requests,
+                    concurrency=args.concurrency,
+                    count_queries=mode == "in-process"
+                )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        await engine.dispose()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mode": mode,
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+        },
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--tasks-per-user", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", help="benchmark an already running server")
+    target.add_argument("--uvicorn", action="store_true", help="start a local uvicorn server")
+    args = parser.parse_args()
+    if "delete" in args.scenarios and args.requests > args.users * args.tasks_per_user:
+        parser.error("delete needs --users * --tasks-per-user >= --requests")
+    asyncio.run(main(args))
@@ -0,0 +1,72 @@
+"""One request per call; each scenario gets (client, context, index)."""
+import itertools
+
+from app.util.enum import TaskStatus
+
+
+class ScenarioContext:
+    def __init__(self, generator, users, run_id: str):
+        self.generator = generator
+        self.users = users
+        self.run_id = run_id
+        self._deletable = itertools.chain.from_iterable(
+            [(user, task_id) for task_id in reversed(user.task_ids)] for user in users
+        )
+
+    def user(self, index: int):
+        return self.users[index % len(self.users)]
+
+    def headers(self, index: int):
+        return {"Authorization": f"Bearer {self.user(index).token}"}
+
+    def task_id(self, index: int):
+        user = self.user(index)
+        return user.task_ids[(index // len(self.users)) % len(user.task_ids)]
+
+    def next_deletable(self):
+        return next(self._deletable)
+
+
+async def register(client, context, index):
+    user = context.generator.user(index, prefix=f"register-{context.run_id}")
+    return await client.post("/auth/register", json={"email": user.email, "password": user.password})
+
+
+async def login(client, context, index):
+    user = context.user(index)
+    return await client.post("/auth/login", json={"email": user.email, "password": user.password})
+
+
+async def list_tasks(client, context, index):
+    return await client.get("/tasks/", headers=context.headers(index), params={"limit": 50})
+
+
+async def get_task(client, context, index):
+    return await client.get(f"/tasks/{context.task_id(index)}", headers=context.headers(index))
+
+
+async def update_task(client, context, index):
+    status = TaskStatus.completed if index % 2 else TaskStatus.pending
+    return await client.put(
+        f"/tasks/{context.task_id(index)}",
+        headers=context.headers(index),
+        json={"status": status.value}
+    )
+
+
+async def delete_task(client, context, index):
+    user, task_id = context.next_deletable()
+    return await client.delete(
+        f"/tasks/{task_id}",
+        headers={"Authorization": f"Bearer {user.token}"}
+    )
+
+
+SCENARIOS = {
+    "register": register,
+    "login": login,
+    "list": list_tasks,
+    "get": get_task,
+    "update": update_task,
+    "delete": delete_task,
+}
@@ -0,0 +1,85 @@
+"""Task list serialization: default response_model path vs. row fast path.
+
+The default path mirrors what FastAPI does for response_model=list[TaskResponse]:
+validate every ORM object through from_attributes, dump to JSON-compatible
+Python and encode with JSONResponse. The fast path dumps row dicts through
+the pre-built task_rows_adapter (TASKS_FAST_JSON=true).
+
+    python -m benchmarks.serialization --sizes 100 1000 10000
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models.task import Task
+from app.schemas.task import TaskResponse, task_rows_adapter
+from app.services.task_service import TASK_COLUMNS
+
+response_adapter = TypeAdapter(list[TaskResponse])
+keys = [column.key for column in TASK_COLUMNS]
+
+
+def _tasks(count):
+    start = datetime(2026, 1, 1)
+    return [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            description="x" * 80 if i % 2 else None,
+            status="pending",
+            user_id=1,
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def default_path(tasks):
+    validated = response_adapter.validate_python(tasks, from_attributes=True)
+    return JSONResponse(response_adapter.dump_python(validated, mode="json")).body
+
+
+def fast_path(rows):
+    return task_rows_adapter.dump_json([dict(zip(keys, row)) for row in rows])
+
+
+def _best_of(func, arg, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(sizes, repeat):
+    results = []
+    for size in sizes:
+        tasks = _tasks(size)
+        rows = [tuple(getattr(task, key) for key in keys) for task in tasks]
+        assert default_path(tasks) == fast_path(rows)
+
+        default_s = _best_of(default_path, tasks, repeat)
+        fast_s = _best_of(fast_path, rows, repeat)
+        results.append({
+            "tasks": size,
+            "default_ms": round(default_s * 1000, 3),
+            "fast_ms": round(fast_s * 1000, 3),
+            "speedup": round(default_s / fast_s, 2),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
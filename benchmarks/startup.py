@@ -0,0 +1,110 @@
+"""Cold-start cost: import time and first-request latency with and without warm-up.
+
+Each run spawns a fresh uvicorn worker on a fresh database and reports how
+long the server took to accept connections (this includes the lifespan
+warm-up) and the latency of the first register, login and GET /tasks calls,
+which otherwise pay for pool connections, statement compilation and the
+Argon2 backend.
+
+    python -m benchmarks.startup --runs 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks.run import _free_port
+from benchmarks.stats import summarize
+
+_IMPORT_PROBE = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _import_time(env):
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _timed(samples, name, request):
+    start = time.perf_counter()
+    response = request()
+    samples.setdefault(name, []).append(time.perf_counter() - start)
+    response.raise_for_status()
+    return response
+
+
+def _cold_start(warmup: bool, samples):
+    from app.core.database import Base
+
+    db_dir = tempfile.mkdtemp(prefix="task-bench-")
+    sync_engine = create_engine(f"sqlite:///{db_dir}/server.db")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{db_dir}/server.db",
+        "WARMUP_ENABLED": str(warmup).lower(),
+        "AUTH_RATE_LIMIT_ENABLED": "false",
+    }
+    env.pop("READ_DATABASE_URL", None)
+    samples.setdefault("import", []).append(_import_time(env))
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    client.get("/metrics")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError("uvicorn did not start")
+                    time.sleep(0.02)
+            samples.setdefault("ready", []).append(time.perf_counter() - start)
+
+            credentials = {"email": "bench@example.com", "password": "benchpassword"}
+            _timed(samples, "first_register", lambda: client.post("/auth/register", json=credentials))
+            token = _timed(
+                samples, "first_login", lambda: client.post("/auth/login", json=credentials)
+            ).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            _timed(samples, "first_list", lambda: client.get("/tasks/", headers=headers))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(args):
+    report = {}
+    for label, warmup in (("warmup_off", False), ("warmup_on", True)):
+        samples = {}
+        for _ in range(args.runs):
+            _cold_start(warmup, samples)
+        report[label] = {name: summarize(values) for name, values in samples.items()}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    main(parser.parse_args())